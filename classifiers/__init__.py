@@ -6,7 +6,7 @@ from .regex_classifier import RegexClassifier
 from .ml_classifier import MLClassifier
 from .layout_classifier import LayoutClassifier
 from .supplier_detector import SupplierDetector
-from .intelligent_classifier import IntelligentClassifier
+from .intelligent_classifier import IntelligentClassifier, get_intelligent_classifier
 
 __all__ = [
     "DocumentClassifier", 
@@ -14,5 +14,6 @@ __all__ = [
     "MLClassifier", 
     "LayoutClassifier", 
     "SupplierDetector", 
-    "IntelligentClassifier"
+    "IntelligentClassifier",
+    "get_intelligent_classifier"
 ]
\ No newline at end of file
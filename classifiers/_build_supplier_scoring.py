@@ -0,0 +1,30 @@
+"""
+Compilación anticipada (AOT) de aggregate_scores con numba.pycc.
+
+Generar la extensión classifiers/_supplier_scoring con:
+    python -m classifiers._build_supplier_scoring
+
+Si la extensión está compilada, supplier_detector la usa en lugar de la
+versión @njit, así los procesos worker (forkserver/spawn) no pagan la
+compilación JIT en su primera llamada. Sin ella el comportamiento es el mismo.
+"""
+from pathlib import Path
+
+from numba.pycc import CC
+
+from classifiers.supplier_detector import aggregate_scores
+
+# Tipos de los arrays que arma SupplierDetector (ver _build_score_index)
+AGGREGATE_SCORES_SIGNATURE = "f8[:](i4[:], i4[:], i4[:], i4[:], i1[:], i2[:], i4[:], i8, i8)"
+
+cc = CC("_supplier_scoring")
+cc.output_dir = str(Path(__file__).parent)
+cc.verbose = True
+# La versión @njit expone la función Python original en py_func
+cc.export("aggregate_scores", AGGREGATE_SCORES_SIGNATURE)(
+    getattr(aggregate_scores, "py_func", aggregate_scores)
+)
+
+
+if __name__ == "__main__":
+    cc.compile()
@@ -8,6 +8,31 @@ from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Patrones de cada elemento requerido, unidos en una sola alternativa por elemento
+_ELEMENT_PATTERNS = {
+    element: re.compile("|".join(f"(?:{pattern})" for pattern in patterns), re.IGNORECASE)
+    for element, patterns in {
+        "precio": [r"precio", r"\$\s*[\d,]+", r"valor", r"importe"],
+        "peso": [r"peso", r"\d+\s*(?:kg|tn|toneladas)", r"balanza", r"báscula"],
+        "grano": [r"soja|trigo|ma[íi]z|girasol|sorgo|cereales|granos"],
+        "certificado": [r"certificado", r"cert\.", r"certificación"],
+        "transferencia": [r"transferencia", r"transfer", r"cesión"],
+        "depósito": [r"depósito", r"almacén", r"storage", r"acopio"],
+        "transporte": [r"transporte", r"flete", r"camión", r"transportista"],
+        "destino": [r"destino", r"entregar", r"delivery", r"dirección"],
+        "contrato": [r"contrato", r"acuerdo", r"convenio", r"términos"]
+    }.items()
+}
+
+# Patrones de extracción de indicadores
+_WEIGHT_RE = re.compile(r"(\d+(?:,\d+)*(?:\.\d+)?)\s*(kg|tn|toneladas?|quintales?)", re.IGNORECASE)
+_PRICE_RES = [
+    re.compile(r"\$\s*([\d,]+(?:\.\d+)?)", re.IGNORECASE),
+    re.compile(r"precio[:\s]*([\d,]+(?:\.\d+)?)", re.IGNORECASE)
+]
+_QUALITY_RE = re.compile(r"(humedad|proteína|aceite)[:\s]*([\d,]+(?:\.\d+)?)\s*%?", re.IGNORECASE)
+_DATE_RE = re.compile(r"(\d{1,2}[\/\-]\d{1,2}[\/\-]\d{4})")
+
 
 class AgroDocumentClassifier:
     """Clasificador especializado para documentos agropecuarios"""
@@ -95,6 +120,15 @@ class AgroDocumentClassifier:
             "procesos": ["cosecha", "acopio", "almacenaje", "secado", "clasificación", "limpieza"],
             "actores": ["productor", "acopiador", "exportador", "cooperativa", "cerealera"]
         }
+        
+        # Patrones compilados una sola vez (se evalúan en cada clasificación)
+        self._compiled_patterns = {
+            doc_type: [re.compile(pattern, re.IGNORECASE) for pattern in config["patterns"]]
+            for doc_type, config in self.agro_patterns.items()
+        }
+        self._measure_patterns = [
+            re.compile(rf"\b{measure}\b") for measure in self.agro_terms["medidas"]
+        ]
     
     def classify_agro_document(self, text: str) -> Tuple[str, float, Dict]:
         """
@@ -154,8 +188,8 @@ class AgroDocumentClassifier:
         
         # Puntuación por patrones específicos
         pattern_score = 0
-        for pattern in config["patterns"]:
-            matches = re.findall(pattern, text, re.IGNORECASE)
+        for pattern in self._compiled_patterns[doc_type]:
+            matches = pattern.findall(text)
             if matches:
                 pattern_score += 0.2 * len(matches)
                 patterns_found.extend(matches)
@@ -188,24 +222,8 @@ class AgroDocumentClassifier:
         """
         Verifica la presencia de elementos requeridos específicos
         """
-        element_patterns = {
-            "precio": [r"precio", r"\$\s*[\d,]+", r"valor", r"importe"],
-            "peso": [r"peso", r"\d+\s*(?:kg|tn|toneladas)", r"balanza", r"báscula"],
-            "grano": [r"soja|trigo|ma[íi]z|girasol|sorgo|cereales|granos"],
-            "certificado": [r"certificado", r"cert\.", r"certificación"],
-            "transferencia": [r"transferencia", r"transfer", r"cesión"],
-            "depósito": [r"depósito", r"almacén", r"storage", r"acopio"],
-            "transporte": [r"transporte", r"flete", r"camión", r"transportista"],
-            "destino": [r"destino", r"entregar", r"delivery", r"dirección"],
-            "contrato": [r"contrato", r"acuerdo", r"convenio", r"términos"]
-        }
-        
-        if element in element_patterns:
-            for pattern in element_patterns[element]:
-                if re.search(pattern, text, re.IGNORECASE):
-                    return True
-        
-        return False
+        pattern = _ELEMENT_PATTERNS.get(element)
+        return pattern is not None and pattern.search(text) is not None
     
     def _calculate_agro_bonus(self, text: str, details: Dict) -> float:
         """
@@ -219,8 +237,8 @@ class AgroDocumentClassifier:
                 bonus += 0.05
         
         # Bonificación por unidades de medida agropecuarias
-        for measure in self.agro_terms["medidas"]:
-            if re.search(rf"\b{measure}\b", text):
+        for measure_pattern in self._measure_patterns:
+            if measure_pattern.search(text):
                 bonus += 0.03
         
         # Bonificación por términos de calidad
@@ -277,28 +295,21 @@ class AgroDocumentClassifier:
                 indicators["grains_mentioned"].append(grain)
         
         # Extraer pesos
-        weight_patterns = [r"(\d+(?:,\d+)*(?:\.\d+)?)\s*(kg|tn|toneladas?|quintales?)"]
-        for pattern in weight_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            indicators["weights_found"].extend([f"{match[0]} {match[1]}" for match in matches])
+        indicators["weights_found"].extend(
+            f"{match[0]} {match[1]}" for match in _WEIGHT_RE.findall(text)
+        )
         
         # Extraer precios
-        price_patterns = [r"\$\s*([\d,]+(?:\.\d+)?)", r"precio[:\s]*([\d,]+(?:\.\d+)?)"]
-        for pattern in price_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            indicators["prices_found"].extend(matches)
+        for pattern in _PRICE_RES:
+            indicators["prices_found"].extend(pattern.findall(text))
         
         # Extraer parámetros de calidad
-        quality_patterns = [r"(humedad|proteína|aceite)[:\s]*([\d,]+(?:\.\d+)?)\s*%?"]
-        for pattern in quality_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            indicators["quality_params"].extend([f"{match[0]}: {match[1]}%" for match in matches])
+        indicators["quality_params"].extend(
+            f"{match[0]}: {match[1]}%" for match in _QUALITY_RE.findall(text)
+        )
         
         # Extraer fechas
-        date_patterns = [r"(\d{1,2}[\/\-]\d{1,2}[\/\-]\d{4})"]
-        for pattern in date_patterns:
-            matches = re.findall(pattern, text)
-            indicators["dates_found"].extend(matches)
+        indicators["dates_found"].extend(_DATE_RE.findall(text))
         
         return indicators
     
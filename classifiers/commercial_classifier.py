@@ -8,6 +8,42 @@ from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Patrones de cada elemento requerido, unidos en una sola alternativa por elemento
+_ELEMENT_PATTERNS = {
+    element: re.compile("|".join(f"(?:{pattern})" for pattern in patterns), re.IGNORECASE)
+    for element, patterns in {
+        "transferencia": [r"transferencia", r"transfer", r"giro", r"envío"],
+        "banco": [r"banco", r"bank", r"entidad\s+financiera", r"cbu", r"swift"],
+        "importe": [r"importe", r"monto", r"cantidad", r"\$\s*[\d,]+", r"amount"],
+        "orden": [r"orden", r"order", r"solicitud", r"autorizaci[óo]n"],
+        "pago": [r"pago", r"payment", r"abono", r"cancelaci[óo]n"],
+        "beneficiario": [r"beneficiario", r"beneficiary", r"destinatario", r"p[áa]guese\s+a"],
+        "cheque": [r"cheque", r"check", r"ch\s+n", r"n[úu]mero.*cheque"],
+        "recibo": [r"recibo", r"receipt", r"comprobante", r"recib[íi]"],
+        "cuenta": [r"cuenta", r"account", r"cta", r"n[úu]mero.*cuenta"],
+        "saldo": [r"saldo", r"balance", r"disponible", r"movimiento"],
+        "nota": [r"nota", r"note", r"comprobante", r"documento"],
+        "credito": [r"cr[ée]dito", r"credit", r"devoluci[óo]n", r"reintegro", r"bonificaci[óo]n"],
+        "debito": [r"d[ée]bito", r"debit", r"cargo", r"recargo", r"ajuste"]
+    }.items()
+}
+
+# Patrones de extracción de indicadores
+_AMOUNT_RES = [
+    re.compile(r"\$\s*([\d,]+(?:\.\d+)?)", re.IGNORECASE),
+    re.compile(r"(?:usd|ars|eur)\s*([\d,]+(?:\.\d+)?)", re.IGNORECASE)
+]
+_ACCOUNT_RES = [
+    re.compile(r"(?:cuenta|cbu|cta).*?(\d{10,})", re.IGNORECASE),
+    re.compile(r"alias.*?([a-zA-Z0-9.]+)", re.IGNORECASE)
+]
+_BANK_RES = [
+    re.compile(r"banco\s+([a-záéíóúñ\s]+)", re.IGNORECASE),
+    re.compile(r"(bbva|santander|galicia|nación|macro|icbc)", re.IGNORECASE)
+]
+_PAYMENT_RE = re.compile(r"(transferencia|cheque|efectivo|débito|crédito)", re.IGNORECASE)
+_DATE_RE = re.compile(r"(\d{1,2}[\/\-]\d{1,2}[\/\-]\d{4})")
+
 
 class CommercialDocumentClassifier:
     """Clasificador especializado para documentos comerciales y financieros"""
@@ -128,6 +164,15 @@ class CommercialDocumentClassifier:
             "ajustes": ["devolución", "reintegro", "bonificación", "descuento", "cargo", "recargo", "ajuste"],
             "notas": ["nota", "comprobante", "documento", "emisión", "anulación", "reversión"]
         }
+        
+        # Patrones compilados una sola vez (se evalúan en cada clasificación)
+        self._compiled_patterns = {
+            doc_type: [re.compile(pattern, re.IGNORECASE) for pattern in config["patterns"]]
+            for doc_type, config in self.commercial_patterns.items()
+        }
+        self._currency_patterns = [
+            re.compile(rf"\b{currency}\b") for currency in self.commercial_terms["monedas"]
+        ]
     
     def classify_commercial_document(self, text: str) -> Tuple[str, float, Dict]:
         """
@@ -187,8 +232,8 @@ class CommercialDocumentClassifier:
         
         # Puntuación por patrones específicos
         pattern_score = 0
-        for pattern in config["patterns"]:
-            matches = re.findall(pattern, text, re.IGNORECASE)
+        for pattern in self._compiled_patterns[doc_type]:
+            matches = pattern.findall(text)
             if matches:
                 pattern_score += 0.2 * len(matches)
                 patterns_found.extend(matches)
@@ -221,28 +266,8 @@ class CommercialDocumentClassifier:
         """
         Verifica la presencia de elementos requeridos específicos
         """
-        element_patterns = {
-            "transferencia": [r"transferencia", r"transfer", r"giro", r"envío"],
-            "banco": [r"banco", r"bank", r"entidad\s+financiera", r"cbu", r"swift"],
-            "importe": [r"importe", r"monto", r"cantidad", r"\$\s*[\d,]+", r"amount"],
-            "orden": [r"orden", r"order", r"solicitud", r"autorizaci[óo]n"],
-            "pago": [r"pago", r"payment", r"abono", r"cancelaci[óo]n"],
-            "beneficiario": [r"beneficiario", r"beneficiary", r"destinatario", r"p[áa]guese\s+a"],
-            "cheque": [r"cheque", r"check", r"ch\s+n", r"n[úu]mero.*cheque"],
-            "recibo": [r"recibo", r"receipt", r"comprobante", r"recib[íi]"],
-            "cuenta": [r"cuenta", r"account", r"cta", r"n[úu]mero.*cuenta"],
-            "saldo": [r"saldo", r"balance", r"disponible", r"movimiento"],
-            "nota": [r"nota", r"note", r"comprobante", r"documento"],
-            "credito": [r"cr[ée]dito", r"credit", r"devoluci[óo]n", r"reintegro", r"bonificaci[óo]n"],
-            "debito": [r"d[ée]bito", r"debit", r"cargo", r"recargo", r"ajuste"]
-        }
-        
-        if element in element_patterns:
-            for pattern in element_patterns[element]:
-                if re.search(pattern, text, re.IGNORECASE):
-                    return True
-        
-        return False
+        pattern = _ELEMENT_PATTERNS.get(element)
+        return pattern is not None and pattern.search(text) is not None
     
     def _calculate_commercial_bonus(self, text: str, details: Dict) -> float:
         """
@@ -261,8 +286,8 @@ class CommercialDocumentClassifier:
                 bonus += 0.05
         
         # Bonificación por monedas mencionadas
-        for currency in self.commercial_terms["monedas"]:
-            if re.search(rf"\b{currency}\b", text):
+        for currency_pattern in self._currency_patterns:
+            if currency_pattern.search(text):
                 bonus += 0.03
         
         # Bonificación por términos de cuentas
@@ -319,33 +344,22 @@ class CommercialDocumentClassifier:
         text_lower = text.lower()
         
         # Extraer importes
-        amount_patterns = [r"\$\s*([\d,]+(?:\.\d+)?)", r"(?:usd|ars|eur)\s*([\d,]+(?:\.\d+)?)"]
-        for pattern in amount_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            indicators["amounts_found"].extend([f"${match}" for match in matches])
+        for pattern in _AMOUNT_RES:
+            indicators["amounts_found"].extend(f"${match}" for match in pattern.findall(text))
         
         # Extraer números de cuenta
-        account_patterns = [r"(?:cuenta|cbu|cta).*?(\d{10,})", r"alias.*?([a-zA-Z0-9.]+)"]
-        for pattern in account_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            indicators["account_numbers"].extend(matches)
+        for pattern in _ACCOUNT_RES:
+            indicators["account_numbers"].extend(pattern.findall(text))
         
         # Extraer bancos mencionados
-        bank_patterns = [r"banco\s+([a-záéíóúñ\s]+)", r"(bbva|santander|galicia|nación|macro|icbc)"]
-        for pattern in bank_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            indicators["banks_mentioned"].extend(matches)
+        for pattern in _BANK_RES:
+            indicators["banks_mentioned"].extend(pattern.findall(text))
         
         # Extraer métodos de pago
-        payment_patterns = [r"(transferencia|cheque|efectivo|débito|crédito)"]
-        matches = re.findall(payment_patterns[0], text, re.IGNORECASE)
-        indicators["payment_methods"].extend(matches)
+        indicators["payment_methods"].extend(_PAYMENT_RE.findall(text))
         
         # Extraer fechas
-        date_patterns = [r"(\d{1,2}[\/\-]\d{1,2}[\/\-]\d{4})"]
-        for pattern in date_patterns:
-            matches = re.findall(pattern, text)
-            indicators["dates_found"].extend(matches)
+        indicators["dates_found"].extend(_DATE_RE.findall(text))
         
         return indicators
     
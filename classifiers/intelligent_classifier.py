@@ -11,6 +11,7 @@ Clasificador inteligente que         # Pesos para cada método de clasificación
         }últiples métodos con pesos ajustables
 """
 import logging
+from functools import lru_cache
 from typing import Dict, Tuple, List, Optional
 from .document_classifier import DocumentClassifier
 from .regex_classifier import RegexClassifier
@@ -72,6 +73,52 @@ class IntelligentClassifier:
             text: Texto del documento
             file_path: Ruta al archivo PDF (opcional, para análisis de layout)
             
+        Returns:
+            Diccionario con clasificación completa y detalles
+        """
+        return self._classify(text, file_path)
+    
+    def classify_documents(self, texts: List[str], file_paths: Optional[List[str]] = None) -> List[Dict]:
+        """
+        Clasifica un lote de documentos
+        
+        La predicción ML se resuelve con una sola llamada al pipeline para
+        todo el lote; el resto de los métodos se aplica documento a documento.
+        
+        Args:
+            texts: Textos de los documentos
+            file_paths: Rutas a los archivos PDF, alineadas con texts (opcional)
+            
+        Returns:
+            Lista de resultados en el mismo orden que texts
+        """
+        if file_paths is None:
+            file_paths = [None] * len(texts)
+        elif len(file_paths) != len(texts):
+            raise ValueError("texts y file_paths deben tener la misma longitud")
+        
+        ml_predictions = [None] * len(texts)
+        if self.ml_classifier and texts:
+            try:
+                ml_predictions = self.ml_classifier.classify_by_ml_batch(texts)
+            except Exception as e:
+                logger.warning(f"Error en clasificación ML por lote: {e}")
+        
+        return [
+            self._classify(text, file_path, ml_prediction)
+            for text, file_path, ml_prediction in zip(texts, file_paths, ml_predictions)
+        ]
+    
+    def _classify(self, text: str, file_path: Optional[str] = None,
+                  ml_prediction: Optional[Tuple[str, float]] = None) -> Dict:
+        """
+        Implementación de classify_document
+        
+        Args:
+            text: Texto del documento
+            file_path: Ruta al archivo PDF (opcional, para análisis de layout)
+            ml_prediction: Resultado ML ya calculado por lote (opcional)
+            
         Returns:
             Diccionario con clasificación completa y detalles
         """
@@ -146,7 +193,9 @@ class IntelligentClassifier:
             # 4. Machine Learning (si está disponible)
             if self.ml_classifier:
                 try:
-                    ml_type, ml_conf = self.ml_classifier.classify_by_ml(text)
+                    if ml_prediction is None:
+                        ml_prediction = self.ml_classifier.classify_by_ml(text)
+                    ml_type, ml_conf = ml_prediction
                     results["method_results"]["ml"] = {
                         "type": ml_type,
                         "confidence": ml_conf
@@ -544,4 +593,29 @@ class IntelligentClassifier:
         
         metrics["available_methods"].extend(["keyword", "regex", "supplier"])
         
-        return metrics
\ No newline at end of file
+        return metrics
+
+
+@lru_cache(maxsize=None)
+def _cached_intelligent_classifier(enable_ml: bool, enable_layout: bool,
+                                   enable_agro: bool, enable_commercial: bool) -> IntelligentClassifier:
+    return IntelligentClassifier(
+        enable_ml=enable_ml,
+        enable_layout=enable_layout,
+        enable_agro=enable_agro,
+        enable_commercial=enable_commercial
+    )
+
+
+def get_intelligent_classifier(enable_ml: bool = True, enable_layout: bool = True,
+                               enable_agro: bool = True, enable_commercial: bool = True) -> IntelligentClassifier:
+    """
+    Retorna el clasificador inteligente compartido para la combinación de métodos
+    
+    Cargar los modelos ML y de layout es costoso, así que cada proceso lo hace una
+    sola vez por combinación. Ojo: adjust_weights afecta a todos los que lo comparten.
+    """
+    # Los argumentos se normalizan para que llamadas equivalentes compartan instancia
+    return _cached_intelligent_classifier(
+        bool(enable_ml), bool(enable_layout), bool(enable_agro), bool(enable_commercial)
+    )
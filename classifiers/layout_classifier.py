@@ -155,10 +155,9 @@ class LayoutClassifier:
                 }
                 
                 # Extraer texto del bloque
-                block_text = ""
-                for line in block["lines"]:
-                    for span in line["spans"]:
-                        block_text += span["text"] + " "
+                block_text = "".join(
+                    span["text"] + " " for line in block["lines"] for span in line["spans"]
+                )
                 
                 text_blocks.append({
                     "text": block_text.strip(),
@@ -234,10 +233,9 @@ class LayoutClassifier:
         
         for block in blocks:
             if "lines" in block:
-                block_text = ""
-                for line in block["lines"]:
-                    for span in line["spans"]:
-                        block_text += span["text"].lower() + " "
+                block_text = "".join(
+                    span["text"].lower() + " " for line in block["lines"] for span in line["spans"]
+                )
                 
                 # Contar palabras clave de tabla
                 for keyword in table_keywords:
@@ -263,6 +263,42 @@ class MLClassifier:
             logger.error(f"Error en clasificación ML: {e}")
             return "desconocido", 0.0
     
+    def classify_by_ml_batch(self, texts: List[str]) -> List[Tuple[str, float]]:
+        """
+        Clasifica varios documentos con una sola pasada del pipeline
+        
+        Args:
+            texts: Textos de los documentos
+            
+        Returns:
+            Lista de tuplas (tipo_documento, confidence_score), en el mismo orden
+        """
+        if not texts:
+            return []
+        
+        if not self.is_trained or self.pipeline is None:
+            logger.warning("Modelo ML no entrenado, intentando entrenamiento automático")
+            train_result = self.train_model()
+            
+            if train_result.get("status") != "trained":
+                logger.warning("No se pudo entrenar el modelo ML")
+                return [("desconocido", 0.0)] * len(texts)
+        
+        try:
+            # Una sola vectorización y predict_proba para todo el lote
+            classes = self.pipeline.classes_
+            probabilities = self.pipeline.predict_proba(texts)
+            best = np.argmax(probabilities, axis=1)
+            
+            return [
+                (classes[idx], probabilities[row, idx])
+                for row, idx in enumerate(best)
+            ]
+            
+        except Exception as e:
+            logger.error(f"Error en clasificación ML por lote: {e}")
+            return [("desconocido", 0.0)] * len(texts)
+    
     def get_feature_importance(self, doc_type: str, top_features: int = 20) -> List[Tuple[str, float]]:
         """
         Obtiene las características más importantes para un tipo de documento
@@ -7,14 +7,119 @@ import logging
 from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Reemplazo sin numba: deja la función como Python puro"""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+# Categorías de coincidencia de identidad (nombre / CUIT) del proveedor
+BUCKET_NAME = 0
+BUCKET_CUIT = 1
+BUCKET_PARTIAL_NAME = 2
+
+# Códigos de peso de los términos de patrones: specific_terms / layout_indicators
+TERM_SPECIFIC = 0
+TERM_INDICATOR = 1
+TERM_WEIGHTS = np.array([0.2, 0.1])
+
+# Puntaje máximo alcanzable por un tipo de documento (todos los términos e indicadores)
+MAX_TYPE_SCORE = 0.2 + 0.1
+
+# Tamaño (en bytes) desde el cual el prefiltro usa numpy en lugar de un set
+PRESCAN_NUMPY_MIN_BYTES = 4096
+
+
+@njit(cache=True)
+def aggregate_scores(supplier_idx, bucket_idx, term_ids, term_supplier,
+                     term_weight_code, term_denom, term_slot, n_slots, n_suppliers):
+    """
+    Agrega las coincidencias encontradas en un score por proveedor
+
+    Args:
+        supplier_idx: Índice de proveedor de cada coincidencia de identidad (int32)
+        bucket_idx: Categoría de cada coincidencia de identidad (BUCKET_*) (int32)
+        term_ids: Índices de los términos de patrones encontrados (int32)
+        term_supplier: Proveedor de cada término (int32)
+        term_weight_code: TERM_SPECIFIC o TERM_INDICATOR de cada término (int8)
+        term_denom: Tamaño de la lista que contiene a cada término (int16)
+        term_slot: Slot (proveedor, tipo de documento) de cada término (int32)
+        n_slots: Cantidad total de slots
+        n_suppliers: Cantidad total de proveedores
+
+    Returns:
+        Array float64 con el score de cada proveedor (máximo 1.0)
+    """
+    name_scores = np.zeros(n_suppliers)
+    cuit_scores = np.zeros(n_suppliers)
+
+    for k in range(supplier_idx.shape[0]):
+        supplier = supplier_idx[k]
+        bucket = bucket_idx[k]
+        if bucket == BUCKET_NAME:
+            name_scores[supplier] = 0.4
+        elif bucket == BUCKET_PARTIAL_NAME:
+            if name_scores[supplier] < 0.3:
+                name_scores[supplier] = 0.3
+        elif bucket == BUCKET_CUIT:
+            cuit_scores[supplier] = 0.3
+
+    # Conteos por slot y código de peso, con el denominador de normalización
+    found = np.zeros((n_slots, 2))
+    denoms = np.zeros((n_slots, 2))
+    slot_supplier = np.full(n_slots, -1)
+    for k in range(term_ids.shape[0]):
+        term = term_ids[k]
+        slot = term_slot[term]
+        code = term_weight_code[term]
+        found[slot, code] += 1
+        denoms[slot, code] = term_denom[term]
+        slot_supplier[slot] = term_supplier[term]
+
+    # El score de patrones es el máximo entre los tipos de documento del proveedor;
+    # una vez alcanzado el máximo posible se omiten los slots restantes
+    pattern_scores = np.zeros(n_suppliers)
+    for slot in range(n_slots):
+        supplier = slot_supplier[slot]
+        if supplier < 0 or pattern_scores[supplier] >= MAX_TYPE_SCORE:
+            continue
+        type_score = 0.0
+        for code in range(2):
+            if denoms[slot, code] > 0:
+                type_score += (found[slot, code] / denoms[slot, code]) * TERM_WEIGHTS[code]
+        if type_score > pattern_scores[supplier]:
+            pattern_scores[supplier] = type_score
+
+    scores = name_scores + cuit_scores + pattern_scores
+    return np.minimum(scores, 1.0)
+
+
+# Versión compilada de antemano (python -m classifiers._build_supplier_scoring):
+# evita la compilación JIT en cada proceso nuevo
+try:
+    from ._supplier_scoring import aggregate_scores
+    SCORING_AOT_AVAILABLE = True
+except ImportError:
+    SCORING_AOT_AVAILABLE = False
+
 
 class SupplierDetector:
     """Detecta proveedores específicos y sus patrones de documentos característicos"""
     
     def __init__(self, suppliers_db_path: str = "config/suppliers_db.json"):
         self.suppliers_db_path = suppliers_db_path
+        self._suppliers_file = Path(suppliers_db_path).resolve()
+        self._suppliers_file.parent.mkdir(parents=True, exist_ok=True)
         self.suppliers_db = {}
         self._load_suppliers_db()
         
@@ -46,10 +151,8 @@ class SupplierDetector:
     def _load_suppliers_db(self):
         """Carga la base de datos de proveedores conocidos"""
         try:
-            suppliers_file = Path(self.suppliers_db_path)
-            
-            if suppliers_file.exists():
-                with open(suppliers_file, 'r', encoding='utf-8') as f:
+            if self._suppliers_file.exists():
+                with open(self._suppliers_file, 'r', encoding='utf-8') as f:
                     self.suppliers_db = json.load(f)
                 logger.info(f"Base de datos de proveedores cargada: {len(self.suppliers_db)} proveedores")
             else:
@@ -59,6 +162,91 @@ class SupplierDetector:
         except Exception as e:
             logger.error(f"Error cargando base de datos de proveedores: {e}")
             self._create_default_suppliers_db()
+        
+        self._build_score_index()
+    
+    def _build_score_index(self):
+        """
+        Precalcula la representación numérica de la base de proveedores.
+        
+        Los términos de document_patterns se aplanan en arrays paralelos
+        (término, proveedor, código de peso, denominador, slot) para que el
+        scoring recorra memoria contigua en lugar de diccionarios anidados.
+        Nombres, CUITs y términos se normalizan a mayúsculas una sola vez.
+        """
+        self._supplier_ids = list(self.suppliers_db.keys())
+        
+        # (texto, índice de proveedor, categoría) para nombres y CUITs
+        self._identity_table = []
+        # (índice de proveedor, palabras del nombre) para la búsqueda parcial
+        self._partial_names = []
+        
+        all_terms = []
+        term_supplier = []
+        term_weight_code = []
+        term_denom = []
+        term_slot = []
+        n_slots = 0
+        
+        for supplier_idx, supplier_data in enumerate(self.suppliers_db.values()):
+            for name in supplier_data.get("names", []):
+                name_upper = name.upper()
+                self._identity_table.append((name_upper, supplier_idx, BUCKET_NAME))
+                if len(name) > 10:
+                    name_words = name_upper.split()
+                    if len(name_words) >= 2:
+                        self._partial_names.append((supplier_idx, name_words))
+            
+            cuit = supplier_data.get("cuit", "")
+            if cuit:
+                self._identity_table.append((cuit, supplier_idx, BUCKET_CUIT))
+            
+            # Slots en orden de confidence_boost descendente: aggregate_scores deja
+            # de evaluar un proveedor cuando su score alcanza MAX_TYPE_SCORE
+            doc_types = sorted(
+                supplier_data.get("document_patterns", {}).values(),
+                key=lambda patterns: -patterns.get("confidence_boost", 0)
+            )
+            for patterns in doc_types:
+                for key, code in (("specific_terms", TERM_SPECIFIC),
+                                  ("layout_indicators", TERM_INDICATOR)):
+                    terms = patterns.get(key, [])
+                    for term in terms:
+                        all_terms.append(term.upper())
+                        term_supplier.append(supplier_idx)
+                        term_weight_code.append(code)
+                        term_denom.append(len(terms))
+                        term_slot.append(n_slots)
+                n_slots += 1
+        
+        self._all_terms = all_terms
+        self._term_supplier = np.array(term_supplier, dtype=np.int32)
+        self._term_weight_code = np.array(term_weight_code, dtype=np.int8)
+        self._term_denom = np.array(term_denom, dtype=np.int16)
+        self._term_slot = np.array(term_slot, dtype=np.int32)
+        self._n_slots = n_slots
+        
+        # Primer byte UTF-8 de todo texto buscable: si ninguno aparece en el
+        # documento no puede haber coincidencias y se omite el scoring
+        first_bytes = set()
+        searchable = [value for value, _, _ in self._identity_table] + all_terms
+        searchable += [word for _, name_words in self._partial_names for word in name_words]
+        for value in searchable:
+            encoded = value.encode('utf-8')
+            if encoded:
+                first_bytes.add(encoded[0])
+        
+        self._first_bytes = frozenset(first_bytes)
+        self._first_byte_mask = np.zeros(256, dtype=bool)
+        self._first_byte_mask[list(first_bytes)] = True
+    
+    def _has_candidate_bytes(self, text_upper: str) -> bool:
+        """Indica si el texto contiene algún byte inicial de los textos buscables"""
+        data = text_upper.encode('utf-8')
+        if len(data) >= PRESCAN_NUMPY_MIN_BYTES:
+            seen = np.bincount(np.frombuffer(data, dtype=np.uint8), minlength=256) > 0
+            return bool((seen & self._first_byte_mask).any())
+        return not self._first_bytes.isdisjoint(data)
     
     def _create_default_suppliers_db(self):
         """Crea una base de datos inicial con proveedores de ejemplo"""
@@ -140,10 +328,7 @@ class SupplierDetector:
     def _save_suppliers_db(self):
         """Guarda la base de datos de proveedores"""
         try:
-            suppliers_file = Path(self.suppliers_db_path)
-            suppliers_file.parent.mkdir(parents=True, exist_ok=True)
-            
-            with open(suppliers_file, 'w', encoding='utf-8') as f:
+            with open(self._suppliers_file, 'w', encoding='utf-8') as f:
                 json.dump(self.suppliers_db, f, indent=2, ensure_ascii=False)
                 
             logger.info("Base de datos de proveedores guardada")
@@ -161,17 +346,46 @@ class SupplierDetector:
         Returns:
             Tuple con (id_proveedor, confidence_score)
         """
-        best_supplier = None
-        best_score = 0.0
+        if not self._supplier_ids:
+            return None, 0.0
         
         text_upper = text.upper()
         
-        for supplier_id, supplier_data in self.suppliers_db.items():
-            score = self._calculate_supplier_score(text_upper, supplier_data)
-            
-            if score > best_score:
-                best_score = score
-                best_supplier = supplier_id
+        if not self._has_candidate_bytes(text_upper):
+            return None, 0.0
+        
+        supplier_idx = []
+        bucket_idx = []
+        
+        for value, supplier, bucket in self._identity_table:
+            if value in text_upper:
+                supplier_idx.append(supplier)
+                bucket_idx.append(bucket)
+        
+        # Búsqueda parcial para nombres largos (al menos 2 palabras presentes)
+        for supplier, name_words in self._partial_names:
+            found_words = sum(1 for word in name_words if word in text_upper)
+            if found_words >= 2:
+                supplier_idx.append(supplier)
+                bucket_idx.append(BUCKET_PARTIAL_NAME)
+        
+        term_ids = [i for i, term in enumerate(self._all_terms) if term in text_upper]
+        
+        scores = aggregate_scores(
+            np.array(supplier_idx, dtype=np.int32),
+            np.array(bucket_idx, dtype=np.int32),
+            np.array(term_ids, dtype=np.int32),
+            self._term_supplier,
+            self._term_weight_code,
+            self._term_denom,
+            self._term_slot,
+            self._n_slots,
+            len(self._supplier_ids)
+        )
+        
+        best_idx = int(np.argmax(scores))
+        best_score = float(scores[best_idx])
+        best_supplier = self._supplier_ids[best_idx]
         
         # Solo retornar si la confianza es suficiente
         if best_score >= 0.3:  # Umbral mínimo de confianza
@@ -180,56 +394,6 @@ class SupplierDetector:
         
         return None, 0.0
     
-    def _calculate_supplier_score(self, text: str, supplier_data: Dict) -> float:
-        """Calcula la puntuación de coincidencia con un proveedor específico"""
-        score = 0.0
-        
-        # 1. Verificar nombres del proveedor (peso: 0.4)
-        name_score = 0.0
-        for name in supplier_data.get("names", []):
-            if name.upper() in text:
-                name_score = 0.4
-                break
-            # Búsqueda parcial para nombres largos
-            elif len(name) > 10:
-                name_words = name.upper().split()
-                if len(name_words) >= 2:
-                    found_words = sum(1 for word in name_words if word in text)
-                    if found_words >= 2:
-                        name_score = 0.3
-        
-        score += name_score
-        
-        # 2. Verificar CUIT (peso: 0.3)
-        cuit = supplier_data.get("cuit", "")
-        if cuit and cuit in text:
-            score += 0.3
-        
-        # 3. Verificar patrones específicos del documento (peso: 0.3)
-        pattern_score = 0.0
-        document_patterns = supplier_data.get("document_patterns", {})
-        
-        for doc_type, patterns in document_patterns.items():
-            type_score = 0.0
-            
-            # Términos específicos
-            specific_terms = patterns.get("specific_terms", [])
-            terms_found = sum(1 for term in specific_terms if term.upper() in text)
-            if specific_terms:
-                type_score += (terms_found / len(specific_terms)) * 0.2
-            
-            # Indicadores de layout
-            layout_indicators = patterns.get("layout_indicators", [])
-            indicators_found = sum(1 for indicator in layout_indicators if indicator.upper() in text)
-            if layout_indicators:
-                type_score += (indicators_found / len(layout_indicators)) * 0.1
-            
-            pattern_score = max(pattern_score, type_score)
-        
-        score += pattern_score
-        
-        return min(score, 1.0)  # Normalizar a máximo 1.0
-    
     def get_supplier_info(self, supplier_id: str) -> Optional[Dict]:
         """
         Obtiene información completa de un proveedor
@@ -292,6 +456,7 @@ class SupplierDetector:
             supplier_data: Datos del proveedor
         """
         self.suppliers_db[supplier_id] = supplier_data
+        self._build_score_index()
         self._save_suppliers_db()
         logger.info(f"Proveedor agregado: {supplier_id}")
     
@@ -339,6 +504,7 @@ class SupplierDetector:
                 if indicator.upper() not in existing_indicators:
                     patterns["layout_indicators"].append(indicator)
         
+        self._build_score_index()
         self._save_suppliers_db()
         logger.info(f"Patrones actualizados para {supplier_id} - {doc_type}")
     
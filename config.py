@@ -65,7 +65,14 @@ DB_SCHEMA = {
             detalles_clasificacion TEXT,
             metodos_usados TEXT
         )
-    """
+    """,
+    # Índices para las búsquedas por CUIT, por tipo y por proveedor (LIKE '%x%' vía trigramas)
+    "documentos_indices": [
+        "CREATE INDEX IF NOT EXISTS idx_documentos_cuit ON documentos(cuit)",
+        "CREATE INDEX IF NOT EXISTS idx_documentos_tipo ON documentos(tipo)",
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+        "CREATE INDEX IF NOT EXISTS idx_documentos_proveedor_trgm ON documentos USING gin (proveedor gin_trgm_ops)"
+    ]
 }
 
 # 🔧 Configuración de logging avanzada
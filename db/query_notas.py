@@ -1,33 +1,33 @@
 import sqlite3
 
 conn = sqlite3.connect('db/documentos.db')
+conn.row_factory = sqlite3.Row
 cursor = conn.cursor()
+cursor.arraysize = 64
 
 print('BUSCANDO DOCUMENTOS CON NOTAS DE CRÉDITO/DÉBITO...')
 print('=' * 60)
-cursor.execute('''SELECT filename, tipo, proveedor, detalles_clasificacion FROM documentos WHERE LOWER(filename) LIKE '%nota%' OR LOWER(filename) LIKE '%credit%' OR LOWER(filename) LIKE '%debit%' OR LOWER(detalles_clasificacion) LIKE '%nota de crédito%' OR LOWER(detalles_clasificacion) LIKE '%nota de débito%' LIMIT 15''')
-results = cursor.fetchall()
-if results:
-    for i, (filename, tipo, proveedor, detalles) in enumerate(results, 1):
-        print(f'{i}. {filename}')
-        print(f'   Tipo clasificado: {tipo}')
-        print(f'   Proveedor: {proveedor if proveedor else "N/A"}')
-        if detalles:
-            print(f'   Detalles: {detalles[:100]}...')
-        print()
-else:
+cursor.execute('''SELECT filename, tipo, proveedor, SUBSTR(detalles_clasificacion, 1, 100) AS detalles FROM documentos WHERE LOWER(filename) LIKE '%nota%' OR LOWER(filename) LIKE '%credit%' OR LOWER(filename) LIKE '%debit%' OR LOWER(detalles_clasificacion) LIKE '%nota de crédito%' OR LOWER(detalles_clasificacion) LIKE '%nota de débito%' LIMIT 15''')
+found = 0
+for found, row in enumerate(cursor, 1):
+    print(f'{found}. {row["filename"]}')
+    print(f'   Tipo clasificado: {row["tipo"]}')
+    print(f'   Proveedor: {row["proveedor"] if row["proveedor"] else "N/A"}')
+    if row["detalles"]:
+        print(f'   Detalles: {row["detalles"]}...')
+    print()
+if not found:
     print('No se encontraron documentos con notas específicas')
 
 print('\nDOCUMENTOS CLASIFICADOS COMO DESCONOCIDO...')
 print('=' * 50)
-cursor.execute('''SELECT filename, tipo, proveedor, detalles_clasificacion FROM documentos WHERE tipo = 'desconocido' LIMIT 10''')
-unknown_docs = cursor.fetchall()
-for i, (filename, tipo, proveedor, detalles) in enumerate(unknown_docs, 1):
-    print(f'{i}. {filename}')
-    print(f'   Tipo: {tipo}')
-    print(f'   Proveedor: {proveedor if proveedor else "N/A"}')
-    if detalles:
-        print(f'   Detalles: {detalles[:100]}...')
+cursor.execute('''SELECT filename, tipo, proveedor, SUBSTR(detalles_clasificacion, 1, 100) AS detalles FROM documentos WHERE tipo = 'desconocido' LIMIT 10''')
+for i, row in enumerate(cursor, 1):
+    print(f'{i}. {row["filename"]}')
+    print(f'   Tipo: {row["tipo"]}')
+    print(f'   Proveedor: {row["proveedor"] if row["proveedor"] else "N/A"}')
+    if row["detalles"]:
+        print(f'   Detalles: {row["detalles"]}...')
     print()
 
 conn.close()
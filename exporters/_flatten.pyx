@@ -0,0 +1,51 @@
+# cython: language_level=3
+"""
+Aplanado de registros para la exportación CSV compilado con Cython.
+
+Compilar en el lugar con:
+    cythonize -i exporters/_flatten.pyx
+
+Si la extensión no está compilada, advanced_exporter usa la versión en
+Python puro (_flatten_record_py) con el mismo comportamiento.
+"""
+
+
+cpdef list flatten_record(dict record, bint include_details, bint include_methods,
+                          dict positions, Py_ssize_t width):
+    """Aplana un registro en una fila CSV según la posición de cada columna"""
+    cdef list row = [""] * width
+    cdef object key
+    cdef object value
+    cdef object index
+    cdef object details
+    cdef dict consensus
+    cdef str method
+
+    for key, value in record.items():
+        if key != "classification_details":
+            index = positions.get(key)
+            if index is not None:
+                row[<Py_ssize_t>index] = value
+
+    if include_details:
+        details = record.get("classification_details")
+        if details:
+            if include_methods:
+                for method, method_data in details.get("method_results", {}).items():
+                    index = positions.get(f"method_{method}_type")
+                    if index is not None:
+                        row[<Py_ssize_t>index] = method_data.get("type")
+                    index = positions.get(f"method_{method}_confidence")
+                    if index is not None:
+                        row[<Py_ssize_t>index] = method_data.get("confidence")
+
+            consensus = details.get("consensus_analysis", {})
+            if consensus:
+                index = positions.get("consensus_best")
+                if index is not None:
+                    row[<Py_ssize_t>index] = consensus.get("best_consensus")
+                index = positions.get("consensus_strong")
+                if index is not None:
+                    row[<Py_ssize_t>index] = consensus.get("has_strong_consensus")
+
+    return row
@@ -2,25 +2,174 @@
 Sistema de exportación avanzado para múltiples formatos
 """
 import csv
+import gzip
+import importlib.util
 import json
+import lzma
 import sqlite3
+import sys
+import time
 import logging
-import xml.etree.ElementTree as ET
+from xml.sax.saxutils import XMLGenerator
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+from itertools import chain, islice
 from pathlib import Path
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Iterable, Iterator, Tuple
 from datetime import datetime
 from config import EXPORT_CONFIG
-from utils import get_logger
+from utils import (get_logger, get_worker_context, start_worker_log_listener,
+                   configure_worker_logging)
 
 logger = get_logger(__name__)
 
+# xlsxwriter se importa recién en la primera exportación a Excel
+EXCEL_AVAILABLE = importlib.util.find_spec("xlsxwriter") is not None
+if not EXCEL_AVAILABLE:
+    logger.warning("xlsxwriter no disponible - exportación a Excel deshabilitada")
+
+try:
+    import apsw
+    APSW_AVAILABLE = True
+except ImportError:
+    APSW_AVAILABLE = False
+
 try:
-    import pandas as pd
-    import openpyxl
-    EXCEL_AVAILABLE = True
+    import orjson
+    ORJSON_AVAILABLE = True
 except ImportError:
-    EXCEL_AVAILABLE = False
-    logger.warning("pandas/openpyxl no disponible - exportación a Excel deshabilitada")
+    ORJSON_AVAILABLE = False
+
+
+# Registros por cada escritura del CSV
+CSV_WRITE_CHUNK = 10_000
+
+
+
+def _flatten_record_py(record: Dict, include_details: bool, include_methods: bool,
+                       positions: Dict[str, int], width: int) -> list:
+    """
+    Aplana un registro en una fila CSV según la posición de cada columna.
+    
+    Versión en Python puro de exporters/_flatten.pyx; las columnas que no
+    están en positions se descartan.
+    """
+    row = [""] * width
+    
+    for key, value in record.items():
+        if key != "classification_details":
+            index = positions.get(key)
+            if index is not None:
+                row[index] = value
+    
+    if include_details:
+        details = record.get("classification_details")
+        if details:
+            if include_methods:
+                for method, method_data in details.get("method_results", {}).items():
+                    index = positions.get(f"method_{method}_type")
+                    if index is not None:
+                        row[index] = method_data.get("type")
+                    index = positions.get(f"method_{method}_confidence")
+                    if index is not None:
+                        row[index] = method_data.get("confidence")
+            
+            consensus = details.get("consensus_analysis", {})
+            if consensus:
+                index = positions.get("consensus_best")
+                if index is not None:
+                    row[index] = consensus.get("best_consensus")
+                index = positions.get("consensus_strong")
+                if index is not None:
+                    row[index] = consensus.get("has_strong_consensus")
+    
+    return row
+
+
+try:
+    from ._flatten import flatten_record
+    CYTHON_FLATTEN_AVAILABLE = True
+except ImportError:
+    flatten_record = _flatten_record_py
+    CYTHON_FLATTEN_AVAILABLE = False
+
+
+class RawJSON(str):
+    """Texto que ya es JSON válido y se escribe sin volver a serializar"""
+
+
+@lru_cache(maxsize=4096)
+def _parse_details(raw: str) -> Optional[Dict]:
+    """
+    Parsea el JSON de detalles de clasificación (None si es inválido).
+    
+    Se cachea porque los documentos de un mismo lote suelen repetir el mismo
+    texto; el resultado es compartido y los exportadores solo lo leen.
+    """
+    try:
+        if ORJSON_AVAILABLE:
+            return orjson.loads(raw)
+        return json.loads(raw)
+    except ValueError:
+        return None
+
+
+# Extensiones de compresión soportadas al escribir la salida
+COMPRESSION_SUFFIXES = (".gz", ".xz")
+
+# Formato de exportación según la extensión del archivo
+FORMAT_MAP = {
+    ".csv": "csv",
+    ".json": "json",
+    ".xlsx": "excel",
+    ".xls": "excel",
+    ".xml": "xml"
+}
+
+
+def _open_output(path: str, binary: bool = False, **kwargs):
+    """
+    Abre el archivo de salida, comprimiendo al vuelo si termina en .gz o .xz.
+    
+    Se usa el nivel de compresión más rápido para no encarecer la exportación.
+    """
+    mode = 'wb' if binary else 'wt'
+    lower_path = path.lower()
+    if lower_path.endswith(".gz"):
+        return gzip.open(path, mode, compresslevel=1, **kwargs)
+    if lower_path.endswith(".xz"):
+        return lzma.open(path, mode, preset=0, **kwargs)
+    return open(path, mode, **kwargs)
+
+
+def _partitions(records: Iterable[Dict], chunk_size: Optional[int]) -> Iterator[Iterator[Dict]]:
+    """
+    Divide los registros en particiones de a lo sumo chunk_size (consumir en orden).
+    
+    Con chunk_size None o menor o igual a 0 no se particiona: se genera una
+    única partición con todos los registros.
+    """
+    records = iter(records)
+    if chunk_size is None or chunk_size <= 0:
+        yield records
+        return
+    for first_record in records:
+        yield chain([first_record], islice(records, chunk_size - 1))
+
+
+def _tx(value: Any) -> str:
+    """Convierte un valor a texto XML (None como cadena vacía)"""
+    if value is None:
+        return ""
+    return value if type(value) is str else str(value)
+
+
+def _json_bytes(obj: Any) -> bytes:
+    """Serializa un objeto a JSON en UTF-8, usando orjson si está disponible"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, default=str).encode('utf-8')
 
 
 class ExportResult:
@@ -29,6 +178,7 @@ class ExportResult:
     def __init__(self):
         self.success = False
         self.file_path = ""
+        self.file_paths = []
         self.format = ""
         self.records_exported = 0
         self.file_size = 0
@@ -41,6 +191,7 @@ class ExportResult:
         return {
             "success": self.success,
             "file_path": self.file_path,
+            "file_paths": self.file_paths,
             "format": self.format,
             "records_exported": self.records_exported,
             "file_size": self.file_size,
@@ -56,13 +207,62 @@ class AdvancedDataExporter:
     def __init__(self, db_path: str = None):
         self.db_path = None  # Ya no se usa DB_PATH, solo PostgreSQL
         self.config = EXPORT_CONFIG
+        self._conn = None
         self.supported_formats = ["csv", "json", "xml"]
         
         if EXCEL_AVAILABLE:
             self.supported_formats.append("excel")
     
+    def _get_connection(self):
+        """
+        Retorna la conexión SQLite compartida, abriéndola en el primer uso.
+        
+        Usa apsw si está instalado (menor costo por fila) y sqlite3 si no;
+        ambos drivers entregan las filas como tuplas. La conexión es de solo
+        lectura (query_only) para no tomar locks de escritura; solo se ajustan
+        pragmas de lectura que no se persisten en el archivo de la base.
+        """
+        if self._conn is None:
+            if APSW_AVAILABLE:
+                conn = apsw.Connection(self.db_path)
+            else:
+                conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            
+            for pragma in ("temp_store=MEMORY", "mmap_size=268435456",
+                           "cache_size=-20000", "query_only=1"):
+                conn.execute(f"PRAGMA {pragma}").fetchall()
+            self._conn = conn
+        return self._conn
+    
+    @staticmethod
+    def _column_names(cursor) -> List[str]:
+        """Nombres de las columnas del resultado de un cursor sqlite3 o apsw"""
+        if APSW_AVAILABLE and isinstance(cursor, apsw.Cursor):
+            try:
+                return [name for name, _ in cursor.getdescription()]
+            except apsw.ExecutionCompleteError:
+                # La consulta no devolvió filas
+                return []
+        return [column[0] for column in cursor.description]
+    
+    def close(self):
+        """Cierra la conexión a la base de datos si está abierta"""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+    
+    def __del__(self):
+        self.close()
+    
+    def __getstate__(self) -> Dict:
+        # La conexión no se comparte entre procesos: cada uno abre la suya
+        state = self.__dict__.copy()
+        state["_conn"] = None
+        return state
+    
     def export_data(self, output_path: str, format_type: str = None, 
-                   filters: Dict = None, include_details: bool = True) -> ExportResult:
+                   filters: Dict = None, include_details: bool = True,
+                   chunk_size: Optional[int] = None) -> ExportResult:
         """
         Exporta datos de la base de datos al formato especificado
         
@@ -71,12 +271,15 @@ class AdvancedDataExporter:
             format_type: Formato de exportación (auto-detecta si es None)
             filters: Filtros para la consulta de datos
             include_details: Si incluir detalles de clasificación
+            chunk_size: Registros por archivo; al superarlo (CSV, JSON y XML) la
+                salida continúa en archivos "<nombre>.partNNNN<ext>". Por defecto
+                (None o un valor menor o igual a 0) todo va a un solo archivo
             
         Returns:
             ExportResult con información de la exportación
         """
         result = ExportResult()
-        start_time = datetime.now()
+        start_time = time.perf_counter()
         
         try:
             # Detectar formato si no se especifica
@@ -90,36 +293,49 @@ class AdvancedDataExporter:
                 result.errors.append(f"Formato no soportado: {format_type}")
                 return result
             
-            # Obtener datos de la base de datos
-            data = self._fetch_data(filters, include_details)
-            if not data:
+            # Obtener datos de la base de datos (se consumen en streaming)
+            records = self._iter_data(filters, include_details, export_format=format_type)
+            first_record = next(records, None)
+            if first_record is None:
                 result.warnings.append("No se encontraron datos para exportar")
                 result.success = True
                 return result
+            records = chain([first_record], records)
             
             # Crear directorio de salida si no existe
-            Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+            output_file = Path(output_path)
+            output_file.parent.mkdir(parents=True, exist_ok=True)
             
-            # Exportar según el formato
+            # Exportar según el formato (los escritores agregan las particiones extra)
+            result.file_paths = [output_path]
+            exported = 0
             if format_type == "csv":
-                self._export_csv(data, output_path, result)
+                exported = self._export_csv(records, output_path, result, chunk_size,
+                                            filters, include_details)
             elif format_type == "json":
-                self._export_json(data, output_path, result)
+                exported = self._export_json(records, output_path, result, chunk_size)
             elif format_type == "excel":
-                self._export_excel(data, output_path, result)
+                exported = self._export_excel(records, output_path, result, filters)
             elif format_type == "xml":
-                self._export_xml(data, output_path, result)
+                exported = self._export_xml(records, output_path, result, chunk_size)
+            
+            # Calcular estadísticas finales (stat reemplaza a exists)
+            try:
+                output_stat = output_file.stat()
+            except FileNotFoundError:
+                output_stat = None
             
-            # Calcular estadísticas finales
-            if Path(output_path).exists():
-                result.file_path = str(Path(output_path).absolute())
-                result.file_size = Path(output_path).stat().st_size
-                result.records_exported = len(data)
+            if output_stat is not None:
+                part_files = [Path(path) for path in result.file_paths[1:]]
+                result.file_path = str(output_file.absolute())
+                result.file_paths = [result.file_path] + [str(path.absolute()) for path in part_files]
+                result.file_size = output_stat.st_size + sum(path.stat().st_size for path in part_files)
+                result.records_exported = exported
                 result.success = True
             
-            result.export_time = (datetime.now() - start_time).total_seconds()
+            result.export_time = time.perf_counter() - start_time
             
-            logger.info(f"Exportación exitosa: {len(data)} registros a {format_type} en {result.export_time:.2f}s")
+            logger.info(f"Exportación exitosa: {exported} registros a {format_type} en {result.export_time:.2f}s")
             
         except Exception as e:
             result.errors.append(f"Error durante exportación: {str(e)}")
@@ -127,23 +343,84 @@ class AdvancedDataExporter:
         
         return result
     
+    def _part_output_path(self, output_path: str, part: int, result: ExportResult) -> str:
+        """
+        Retorna la ruta de la partición indicada y la registra en el resultado.
+        
+        La partición 0 usa la ruta solicitada; las siguientes se nombran
+        "<nombre>.partNNNN<ext>" respetando la extensión de compresión.
+        """
+        if part == 0:
+            return output_path
+        
+        path = Path(output_path)
+        extension = path.suffix
+        if extension.lower() in COMPRESSION_SUFFIXES:
+            extension = Path(path.stem).suffix + extension
+        stem = path.name[:len(path.name) - len(extension)]
+        part_path = str(path.with_name(f"{stem}.part{part:04d}{extension}"))
+        result.file_paths.append(part_path)
+        return part_path
+    
     def _detect_format(self, file_path: str) -> str:
         """Detecta el formato basándose en la extensión del archivo"""
-        extension = Path(file_path).suffix.lower()
-        format_map = {
-            ".csv": "csv",
-            ".json": "json", 
-            ".xlsx": "excel",
-            ".xls": "excel",
-            ".xml": "xml"
-        }
-        return format_map.get(extension, self.config.get("default_format", "csv"))
+        base, _, extension = file_path.rpartition('.')
+        extension = '.' + extension.lower()
+        if extension in COMPRESSION_SUFFIXES:
+            _, _, extension = base.rpartition('.')
+            extension = '.' + extension.lower()
+        return FORMAT_MAP.get(extension, self.config.get("default_format", "csv"))
+    
+    def _build_where_clause(self, filters: Dict = None) -> Tuple[str, List]:
+        """
+        Construye la cláusula WHERE para los filtros de exportación
+        
+        Args:
+            filters: Filtros para la consulta de datos
+            
+        Returns:
+            Tupla (cláusula WHERE o cadena vacía, lista de parámetros)
+        """
+        params = []
+        where_conditions = []
+        
+        # Aplicar filtros si se proporcionan
+        if filters:
+            if filters.get("document_type"):
+                where_conditions.append("d.tipo = ?")
+                params.append(filters["document_type"])
+            
+            if filters.get("min_confidence"):
+                where_conditions.append("d.confidence >= ?")
+                params.append(filters["min_confidence"])
+            
+            if filters.get("date_from"):
+                where_conditions.append("d.fecha_procesado >= ?")
+                params.append(filters["date_from"])
+            
+            if filters.get("date_to"):
+                where_conditions.append("d.fecha_procesado <= ?")
+                params.append(filters["date_to"])
+            
+            if filters.get("supplier_id"):
+                where_conditions.append("d.proveedor_id = ?")
+                params.append(filters["supplier_id"])
+        
+        if where_conditions:
+            return " WHERE " + " AND ".join(where_conditions), params
+        return "", params
     
-    def _fetch_data(self, filters: Dict = None, include_details: bool = True) -> List[Dict]:
-        """Obtiene datos de la base de datos con filtros opcionales"""
+    def _iter_data(self, filters: Dict = None, include_details: bool = True,
+                   export_format: str = None) -> Iterator[Dict]:
+        """
+        Itera los registros de la base de datos con filtros opcionales.
+        
+        Los registros se leen del cursor uno a uno, sin materializar el
+        resultado completo en memoria. Para export_format="json" los detalles
+        de clasificación se entregan como RawJSON para escribirlos tal cual.
+        """
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row  # Permite acceso por nombre de columna
+            conn = self._get_connection()
             
             # Construcción de consulta base
             base_query = """
@@ -152,256 +429,406 @@ class AdvancedDataExporter:
                 FROM documentos d
             """
             
-            params = []
-            where_conditions = []
-            
-            # Aplicar filtros si se proporcionan
-            if filters:
-                if filters.get("document_type"):
-                    where_conditions.append("d.tipo = ?")
-                    params.append(filters["document_type"])
-                
-                if filters.get("min_confidence"):
-                    where_conditions.append("d.confidence >= ?")
-                    params.append(filters["min_confidence"])
-                
-                if filters.get("date_from"):
-                    where_conditions.append("d.fecha_procesado >= ?")
-                    params.append(filters["date_from"])
-                
-                if filters.get("date_to"):
-                    where_conditions.append("d.fecha_procesado <= ?")
-                    params.append(filters["date_to"])
-                
-                if filters.get("supplier_id"):
-                    where_conditions.append("d.proveedor_id = ?")
-                    params.append(filters["supplier_id"])
-            
-            # Construir consulta final
-            if where_conditions:
-                query = base_query + " WHERE " + " AND ".join(where_conditions)
-            else:
-                query = base_query
-            
-            query += " ORDER BY d.fecha_procesado DESC"
+            where_clause, params = self._build_where_clause(filters)
+            query = base_query + where_clause + " ORDER BY d.fecha_procesado DESC"
             
             cursor = conn.execute(query, params)
-            rows = cursor.fetchall()
-            
-            # Convertir a lista de diccionarios
-            data = []
-            for row in rows:
-                record = dict(row)
-                
-                # Parsear detalles de clasificación si están disponibles
-                if include_details and record.get("detalles_clasificacion"):
-                    try:
-                        details = json.loads(record["detalles_clasificacion"])
-                        record["classification_details"] = details
-                    except json.JSONDecodeError:
-                        record["classification_details"] = None
-                
-                data.append(record)
-            
-            conn.close()
-            return data
+            columns = self._column_names(cursor)
             
         except Exception as e:
             logger.error(f"Error obteniendo datos: {e}")
-            return []
+            return
+        
+        for row in cursor:
+            record = dict(zip(columns, row))
+            
+            # Parsear detalles de clasificación si están disponibles
+            if include_details and record.get("detalles_clasificacion"):
+                if export_format == "json":
+                    # El texto se valida parseándolo (con caché) pero un objeto válido
+                    # se inserta tal cual en lugar de re-serializarlo; el texto
+                    # inválido se exporta como null
+                    raw_details = record["detalles_clasificacion"]
+                    details = _parse_details(raw_details)
+                    record["classification_details"] = (
+                        RawJSON(raw_details) if isinstance(details, dict) else details
+                    )
+                    yield record
+                    continue
+                
+                record["classification_details"] = _parse_details(record["detalles_clasificacion"])
+            
+            yield record
+    
+    def _csv_detail_columns(self, filters: Dict = None, include_methods: bool = True) -> List[str]:
+        """
+        Retorna las columnas CSV de detalles de clasificación de los registros filtrados.
+        
+        Es una pasada previa deliberada sobre detalles_clasificacion para que el
+        encabezado incluya los métodos de cualquier fila. Se resuelve en SQLite
+        (JSON1): devuelve solo los nombres de método distintos, sin traer las
+        filas ni parsear el JSON en Python, y el consenso se busca con LIMIT 1.
+        """
+        where_clause, params = self._build_where_clause(filters)
+        conn = self._get_connection()
+        # CASE evalúa en orden: json_type solo se llama con JSON válido
+        details_sql = "CASE WHEN json_valid(d.detalles_clasificacion) THEN {} END"
+        
+        columns = []
+        if include_methods:
+            methods_query = (
+                "SELECT je.key FROM documentos d, json_each("
+                + details_sql.format(
+                    "CASE WHEN json_type(d.detalles_clasificacion, '$.method_results') = 'object' "
+                    "THEN d.detalles_clasificacion END"
+                )
+                + ", '$.method_results') je" + where_clause
+                + " GROUP BY je.key ORDER BY MIN(d.rowid)"
+            )
+            for (method,) in conn.execute(methods_query, params):
+                columns.append(f"method_{method}_type")
+                columns.append(f"method_{method}_confidence")
+        
+        consensus_condition = details_sql.format(
+            "CASE WHEN json_type(d.detalles_clasificacion, '$.consensus_analysis') = 'object' "
+            "THEN json_extract(d.detalles_clasificacion, '$.consensus_analysis') <> '{}' END"
+        )
+        consensus_query = (
+            "SELECT 1 FROM documentos d"
+            + (where_clause + " AND " if where_clause else " WHERE ")
+            + consensus_condition + " LIMIT 1"
+        )
+        if conn.execute(consensus_query, params).fetchall():
+            columns.append("consensus_best")
+            columns.append("consensus_strong")
+        return columns
     
-    def _export_csv(self, data: List[Dict], output_path: str, result: ExportResult):
-        """Exporta datos a formato CSV"""
+    def _export_csv(self, records: Iterable[Dict], output_path: str, result: ExportResult,
+                    chunk_size: Optional[int] = None, filters: Dict = None,
+                    include_details: bool = True) -> int:
+        """
+        Exporta datos a formato CSV y retorna la cantidad de registros escritos.
+        
+        Las columnas de la tabla salen del primer registro y las de detalles de
+        _csv_detail_columns (todos los registros filtrados); las filas se
+        escriben en bloques de CSV_WRITE_CHUNK. Cada partición de chunk_size
+        registros repite el encabezado.
+        """
+        include_details = include_details and self.config.get("include_classification_details", True)
+        include_methods = self.config.get("include_method_results", True)
+        encoding = self.config.get("csv_encoding", "utf-8")
+        delimiter = self.config.get("csv_separator", ",")
+        exported = 0
+        
         try:
-            with open(output_path, 'w', newline='', encoding=self.config.get("csv_encoding", "utf-8")) as csvfile:
-                if not data:
-                    return
+            records = iter(records)
+            first_record = next(records, None)
+            if first_record is None:
+                return 0
+            
+            header = [key for key in first_record if key != "classification_details"]
+            if include_details:
+                header.extend(self._csv_detail_columns(filters, include_methods))
+            positions = {key: index for index, key in enumerate(header)}
+            width = len(header)
+            
+            for part, part_records in enumerate(_partitions(chain([first_record], records), chunk_size)):
+                part_path = self._part_output_path(output_path, part, result)
                 
-                # Preparar datos para CSV (aplanar estructuras complejas)
-                flattened_data = []
-                for record in data:
-                    flat_record = {}
-                    
-                    # Campos básicos
-                    for key, value in record.items():
-                        if key != "classification_details":
-                            flat_record[key] = value
+                with _open_output(part_path, newline='', encoding=encoding) as csvfile:
+                    writer = csv.writer(csvfile, delimiter=delimiter)
+                    writer.writerow(header)
                     
-                    # Detalles de clasificación (si se incluyen)
-                    if self.config.get("include_classification_details", True):
-                        details = record.get("classification_details")
-                        if details:
-                            # Resultados por método
-                            if self.config.get("include_method_results", True):
-                                method_results = details.get("method_results", {})
-                                for method, method_data in method_results.items():
-                                    flat_record[f"method_{method}_type"] = method_data.get("type")
-                                    flat_record[f"method_{method}_confidence"] = method_data.get("confidence")
-                            
-                            # Información de consenso
-                            consensus = details.get("consensus_analysis", {})
-                            if consensus:
-                                flat_record["consensus_best"] = consensus.get("best_consensus")
-                                flat_record["consensus_strong"] = consensus.get("has_strong_consensus")
+                    buffer = []
+                    for record in part_records:
+                        buffer.append(flatten_record(record, include_details, include_methods,
+                                                     positions, width))
+                        
+                        if len(buffer) >= CSV_WRITE_CHUNK:
+                            writer.writerows(buffer)
+                            exported += len(buffer)
+                            buffer.clear()
                     
-                    flattened_data.append(flat_record)
-                
-                # Escribir CSV
-                fieldnames = flattened_data[0].keys() if flattened_data else []
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames, 
-                                      delimiter=self.config.get("csv_separator", ","))
-                
-                writer.writeheader()
-                writer.writerows(flattened_data)
+                    writer.writerows(buffer)
+                    exported += len(buffer)
                 
         except Exception as e:
             result.errors.append(f"Error exportando CSV: {str(e)}")
+        
+        return exported
     
-    def _export_json(self, data: List[Dict], output_path: str, result: ExportResult):
-        """Exporta datos a formato JSON"""
+    def _export_json(self, records: Iterable[Dict], output_path: str, result: ExportResult,
+                     chunk_size: Optional[int] = None) -> int:
+        """
+        Exporta datos a formato JSON y retorna la cantidad de registros escritos.
+        
+        Los registros se escriben uno por línea a medida que se leen; la
+        metadata (que incluye el total) se escribe al final del objeto. Cada
+        partición de chunk_size registros es un documento JSON completo.
+        """
+        exported = 0
         try:
-            export_data = {
-                "metadata": {
-                    "export_date": datetime.now().isoformat(),
-                    "total_records": len(data),
-                    "format": "json",
-                    "version": "1.0"
-                },
-                "records": data
-            }
-            
-            with open(output_path, 'w', encoding='utf-8') as jsonfile:
-                json.dump(export_data, jsonfile, indent=2, ensure_ascii=False, default=str)
+            for part, part_records in enumerate(_partitions(records, chunk_size)):
+                part_path = self._part_output_path(output_path, part, result)
+                part_exported = 0
+                
+                with _open_output(part_path, binary=True) as jsonfile:
+                    jsonfile.write(b'{\n  "records": [')
+                    
+                    for record in part_records:
+                        jsonfile.write(b",\n    " if part_exported else b"\n    ")
+                        
+                        details = record.get("classification_details")
+                        if isinstance(details, RawJSON):
+                            # Insertar los detalles crudos en lugar de re-serializarlos
+                            del record["classification_details"]
+                            encoded = _json_bytes(record)
+                            jsonfile.write(encoded[:-1])
+                            jsonfile.write(b', "classification_details": ')
+                            jsonfile.write(details.encode('utf-8'))
+                            jsonfile.write(b'}')
+                        else:
+                            jsonfile.write(_json_bytes(record))
+                        part_exported += 1
+                    
+                    metadata = {
+                        "export_date": datetime.now().isoformat(),
+                        "total_records": part_exported,
+                        "format": "json",
+                        "version": "1.0"
+                    }
+                    jsonfile.write(b'\n  ],\n  "metadata": ')
+                    jsonfile.write(_json_bytes(metadata))
+                    jsonfile.write(b'\n}\n')
+                
+                exported += part_exported
                 
         except Exception as e:
             result.errors.append(f"Error exportando JSON: {str(e)}")
+        
+        return exported
     
-    def _export_excel(self, data: List[Dict], output_path: str, result: ExportResult):
-        """Exporta datos a formato Excel (requiere pandas)"""
+    def _export_excel(self, records: Iterable[Dict], output_path: str, result: ExportResult,
+                      filters: Dict = None) -> int:
+        """
+        Exporta datos a formato Excel y retorna la cantidad de registros escritos.
+        
+        Usa xlsxwriter en modo constant_memory: cada fila se vuelca a disco al
+        escribirse, por lo que la memoria no crece con la cantidad de registros.
+        """
         if not EXCEL_AVAILABLE:
-            result.errors.append("Excel no disponible - instalar pandas y openpyxl")
-            return
+            result.errors.append("Excel no disponible - instalar xlsxwriter")
+            return 0
+        
+        import xlsxwriter
+        
+        include_details = self.config.get("include_classification_details", True)
+        exported = 0
         
         try:
-            with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
+            # Los datos se escriben como texto literal (sin fórmulas ni hipervínculos)
+            workbook = xlsxwriter.Workbook(output_path, {
+                'constant_memory': True,
+                'use_zip64': True,
+                'strings_to_formulas': False,
+                'strings_to_urls': False
+            })
+            
+            try:
                 # Hoja principal con resumen
-                df_main = pd.DataFrame([{
-                    key: value for key, value in record.items() 
-                    if key != "classification_details"
-                } for record in data])
-                
-                df_main.to_excel(writer, sheet_name=self.config["excel_sheets"]["summary"], index=False)
+                main_sheet = workbook.add_worksheet(self.config["excel_sheets"]["summary"])
+                methods_sheet = None
+                methods_row = 0
+                headers = None
                 
-                # Hoja detallada con información de clasificación
-                if self.config.get("include_classification_details", True) and data:
-                    detailed_records = []
+                for record in records:
+                    if headers is None:
+                        headers = [key for key in record if key != "classification_details"]
+                        main_sheet.write_row(0, 0, headers)
+                    
+                    exported += 1
+                    main_sheet.write_row(exported, 0, [record.get(header) for header in headers])
                     
-                    for record in data:
+                    # Hoja detallada con información de clasificación
+                    if include_details:
                         details = record.get("classification_details")
                         if details:
-                            method_results = details.get("method_results", {})
-                            for method, method_data in method_results.items():
-                                detailed_records.append({
-                                    "documento_id": record.get("id"),
-                                    "filename": record.get("filename"),
-                                    "metodo": method,
-                                    "tipo_predicho": method_data.get("type"),
-                                    "confianza": method_data.get("confidence"),
-                                    "tipo_final": record.get("tipo"),
-                                    "confianza_final": record.get("confidence")
-                                })
-                    
-                    if detailed_records:
-                        df_detailed = pd.DataFrame(detailed_records)
-                        df_detailed.to_excel(writer, sheet_name=self.config["excel_sheets"]["methods"], index=False)
+                            for method, method_data in details.get("method_results", {}).items():
+                                if methods_sheet is None:
+                                    methods_sheet = workbook.add_worksheet(self.config["excel_sheets"]["methods"])
+                                    methods_sheet.write_row(0, 0, [
+                                        "documento_id", "filename", "metodo", "tipo_predicho",
+                                        "confianza", "tipo_final", "confianza_final"
+                                    ])
+                                methods_row += 1
+                                methods_sheet.write_row(methods_row, 0, [
+                                    record.get("id"),
+                                    record.get("filename"),
+                                    method,
+                                    method_data.get("type"),
+                                    method_data.get("confidence"),
+                                    record.get("tipo"),
+                                    record.get("confidence")
+                                ])
                 
                 # Hoja de estadísticas
-                stats = self._generate_statistics(data)
-                df_stats = pd.DataFrame([stats])
-                df_stats.to_excel(writer, sheet_name="Estadisticas", index=False)
-                
+                stats = self._generate_statistics(filters)
+                stats_sheet = workbook.add_worksheet("Estadisticas")
+                stats_sheet.write_row(0, 0, list(stats.keys()))
+                stats_sheet.write_row(1, 0, list(stats.values()))
+            finally:
+                workbook.close()
+            
         except Exception as e:
             result.errors.append(f"Error exportando Excel: {str(e)}")
+        
+        return exported
     
-    def _export_xml(self, data: List[Dict], output_path: str, result: ExportResult):
-        """Exporta datos a formato XML"""
+    def _export_xml(self, records: Iterable[Dict], output_path: str, result: ExportResult,
+                    chunk_size: Optional[int] = None) -> int:
+        """
+        Exporta datos a formato XML y retorna la cantidad de registros escritos.
+        
+        El documento se escribe de forma incremental con XMLGenerator; la
+        metadata (que incluye el total) se escribe después de los documentos.
+        Cada partición de chunk_size registros es un documento XML completo.
+        """
+        include_details = self.config.get("include_classification_details", True)
+        tx = _tx
+        # Nombre de etiqueta por columna, calculado una sola vez por exportación
+        tag_for = {}
+        exported = 0
         try:
-            root = ET.Element("document_export")
-            
-            # Metadatos
-            metadata = ET.SubElement(root, "metadata")
-            ET.SubElement(metadata, "export_date").text = datetime.now().isoformat()
-            ET.SubElement(metadata, "total_records").text = str(len(data))
-            ET.SubElement(metadata, "format").text = "xml"
-            
-            # Documentos
-            documents = ET.SubElement(root, "documents")
-            
-            for record in data:
-                doc_elem = ET.SubElement(documents, "document")
-                
-                for key, value in record.items():
-                    if key != "classification_details":
-                        elem = ET.SubElement(doc_elem, key.replace(" ", "_"))
-                        elem.text = str(value) if value is not None else ""
+            for part, part_records in enumerate(_partitions(records, chunk_size)):
+                part_path = self._part_output_path(output_path, part, result)
+                part_exported = 0
                 
-                # Detalles de clasificación
-                if self.config.get("include_classification_details", True):
-                    details = record.get("classification_details")
-                    if details:
-                        details_elem = ET.SubElement(doc_elem, "classification_details")
+                with _open_output(part_path, binary=True) as xmlfile:
+                    gen = XMLGenerator(xmlfile, encoding='utf-8', short_empty_elements=True)
+                    
+                    def write_element(name: str, text: str, indent: str, attrs: Dict = None):
+                        gen.ignorableWhitespace(indent)
+                        gen.startElement(name, attrs or {})
+                        gen.characters(text)
+                        gen.endElement(name)
+                    
+                    gen.startDocument()
+                    gen.startElement("document_export", {})
+                    
+                    # Documentos
+                    gen.ignorableWhitespace("\n  ")
+                    gen.startElement("documents", {})
+                    
+                    for record in part_records:
+                        part_exported += 1
+                        gen.ignorableWhitespace("\n    ")
+                        gen.startElement("document", {})
+                        
+                        for key, value in record.items():
+                            if key != "classification_details":
+                                tag = tag_for.get(key)
+                                if tag is None:
+                                    tag = tag_for[key] = sys.intern(key.replace(" ", "_"))
+                                write_element(tag, tx(value), "\n      ")
                         
-                        # Métodos
-                        method_results = details.get("method_results", {})
-                        if method_results:
-                            methods_elem = ET.SubElement(details_elem, "methods")
-                            for method, method_data in method_results.items():
-                                method_elem = ET.SubElement(methods_elem, "method", name=method)
-                                ET.SubElement(method_elem, "type").text = str(method_data.get("type", ""))
-                                ET.SubElement(method_elem, "confidence").text = str(method_data.get("confidence", 0))
-            
-            # Escribir archivo XML
-            tree = ET.ElementTree(root)
-            ET.indent(tree, space="  ", level=0)
-            tree.write(output_path, encoding='utf-8', xml_declaration=True)
+                        # Detalles de clasificación
+                        if include_details:
+                            details = record.get("classification_details")
+                            if details:
+                                gen.ignorableWhitespace("\n      ")
+                                gen.startElement("classification_details", {})
+                                
+                                # Métodos
+                                method_results = details.get("method_results", {})
+                                if method_results:
+                                    gen.ignorableWhitespace("\n        ")
+                                    gen.startElement("methods", {})
+                                    for method, method_data in method_results.items():
+                                        gen.ignorableWhitespace("\n          ")
+                                        gen.startElement("method", {
+                                            "name": method,
+                                            "type": tx(method_data.get("type", "")),
+                                            "confidence": tx(method_data.get("confidence", 0))
+                                        })
+                                        gen.endElement("method")
+                                    gen.ignorableWhitespace("\n        ")
+                                    gen.endElement("methods")
+                                    gen.ignorableWhitespace("\n      ")
+                                
+                                gen.endElement("classification_details")
+                        
+                        gen.ignorableWhitespace("\n    ")
+                        gen.endElement("document")
+                    
+                    if part_exported:
+                        gen.ignorableWhitespace("\n  ")
+                    gen.endElement("documents")
+                    
+                    # Metadatos
+                    gen.ignorableWhitespace("\n  ")
+                    gen.startElement("metadata", {})
+                    write_element("export_date", datetime.now().isoformat(), "\n    ")
+                    write_element("total_records", tx(part_exported), "\n    ")
+                    write_element("format", "xml", "\n    ")
+                    gen.ignorableWhitespace("\n  ")
+                    gen.endElement("metadata")
+                    
+                    gen.ignorableWhitespace("\n")
+                    gen.endElement("document_export")
+                    gen.endDocument()
+
+                exported += part_exported
             
         except Exception as e:
             result.errors.append(f"Error exportando XML: {str(e)}")
-    
-    def _generate_statistics(self, data: List[Dict]) -> Dict:
-        """Genera estadísticas de los datos exportados"""
-        if not data:
-            return {}
         
-        # Estadísticas básicas
-        total_docs = len(data)
-        doc_types = {}
-        confidence_sum = 0
-        suppliers = set()
+        return exported
+    
+    def _generate_statistics(self, filters: Dict = None) -> Dict:
+        """
+        Genera estadísticas de los datos exportados con agregados SQL
         
-        for record in data:
-            # Contar tipos de documento
-            doc_type = record.get("tipo", "desconocido")
-            doc_types[doc_type] = doc_types.get(doc_type, 0) + 1
+        Args:
+            filters: Filtros aplicados a la exportación
             
-            # Sumar confianza para promedio
-            confidence = record.get("confidence", 0)
-            if confidence:
-                confidence_sum += confidence
+        Returns:
+            Diccionario con estadísticas
+        """
+        where_clause, params = self._build_where_clause(filters)
+        
+        try:
+            conn = self._get_connection()
             
-            # Proveedores únicos
-            supplier = record.get("proveedor_id")
-            if supplier:
-                suppliers.add(supplier)
+            # Conteo y suma de confianza por tipo (sin confianza cuenta como 0) y
+            # proveedores únicos en la misma consulta (un solo viaje a SQLite)
+            by_type = conn.execute(f"""
+                SELECT d.tipo, COUNT(*), SUM(COALESCE(d.confidence, 0)),
+                       (SELECT COUNT(DISTINCT NULLIF(d.proveedor_id, ''))
+                        FROM documentos d{where_clause})
+                FROM documentos d{where_clause}
+                GROUP BY d.tipo
+                ORDER BY COUNT(*) DESC, d.tipo
+            """, params + params).fetchall()
+        except Exception as e:
+            logger.error(f"Error calculando estadísticas: {e}")
+            return {}
         
-        avg_confidence = confidence_sum / total_docs if total_docs > 0 else 0
+        if not by_type:
+            return {}
+        
+        # Estadísticas básicas
+        unique_suppliers = by_type[0][3]
+        doc_types = Counter({doc_type: count for doc_type, count, _, _ in by_type})
+        total_docs = sum(doc_types.values())
+        avg_confidence = sum(confidence_sum for _, _, confidence_sum, _ in by_type) / total_docs
+        most_common = doc_types.most_common(1)
         
         stats = {
             "total_documentos": total_docs,
             "confianza_promedio": round(avg_confidence, 3),
             "tipos_documento": len(doc_types),
-            "proveedores_unicos": len(suppliers),
-            "tipo_mas_comun": max(doc_types.items(), key=lambda x: x[1])[0] if doc_types else "N/A"
+            "proveedores_unicos": unique_suppliers,
+            "tipo_mas_comun": most_common[0][0] if most_common else "N/A"
         }
         
         # Agregar conteos por tipo
@@ -411,14 +838,20 @@ class AdvancedDataExporter:
         return stats
     
     def export_multiple_formats(self, base_path: str, formats: List[str] = None, 
-                              filters: Dict = None) -> Dict[str, ExportResult]:
+                              filters: Dict = None,
+                              chunk_size: Optional[int] = None) -> Dict[str, ExportResult]:
         """
         Exporta datos a múltiples formatos simultáneamente
         
+        Cada formato se exporta en un proceso independiente que abre su propia
+        conexión a la base de datos.
+        
         Args:
             base_path: Ruta base para los archivos (sin extensión)
             formats: Lista de formatos a exportar
             filters: Filtros para los datos
+            chunk_size: Registros por archivo antes de particionar la salida
+                (por defecto None: no se particiona)
             
         Returns:
             Diccionario con resultados por formato
@@ -426,22 +859,60 @@ class AdvancedDataExporter:
         if formats is None:
             formats = self.supported_formats
         
-        results = {}
-        
+        # Generar nombre de archivo con extensión apropiada para cada formato
+        file_paths = {}
         for fmt in formats:
             if fmt in self.supported_formats:
-                # Generar nombre de archivo con extensión apropiada
                 if fmt == "excel":
-                    file_path = f"{base_path}.xlsx"
+                    file_paths[fmt] = f"{base_path}.xlsx"
                 else:
-                    file_path = f"{base_path}.{fmt}"
-                
-                result = self.export_data(file_path, fmt, filters)
-                results[fmt] = result
+                    file_paths[fmt] = f"{base_path}.{fmt}"
             else:
                 logger.warning(f"Formato no soportado: {fmt}")
         
-        return results
+        if len(file_paths) <= 1:
+            return {
+                fmt: self.export_data(file_path, fmt, filters, chunk_size=chunk_size)
+                for fmt, file_path in file_paths.items()
+            }
+        
+        completed = {}
+        
+        # Procesos creados con forkserver o spawn (no fork) y con sus registros
+        # enviados a los handlers de este proceso
+        context = get_worker_context()
+        log_queue, log_listener = start_worker_log_listener(context)
+        executor = ProcessPoolExecutor(
+            max_workers=len(file_paths),
+            mp_context=context,
+            initializer=configure_worker_logging,
+            initargs=(log_queue, logging.getLogger().getEffectiveLevel())
+        )
+        
+        try:
+            with executor:
+                future_to_format = {
+                    executor.submit(self.export_data, file_path, fmt, filters,
+                                    chunk_size=chunk_size): fmt
+                    for fmt, file_path in file_paths.items()
+                }
+                
+                for future in as_completed(future_to_format):
+                    fmt = future_to_format[future]
+                    
+                    try:
+                        completed[fmt] = future.result()
+                    except Exception as e:
+                        error_result = ExportResult()
+                        error_result.format = fmt
+                        error_result.errors.append(f"Error en proceso de exportación: {e}")
+                        completed[fmt] = error_result
+                        logger.error(f"Error exportando formato {fmt}: {e}")
+        finally:
+            log_listener.stop()
+        
+        # Mantener el orden de los formatos solicitados
+        return {fmt: completed[fmt] for fmt in file_paths}
     
     def get_export_summary(self, results: Dict[str, ExportResult]) -> Dict:
         """
@@ -1,7 +1,7 @@
 """
 Módulo de extractores para el agente PDF
 """
-from .text_extractor import TextExtractor
+from .text_extractor import TextExtractor, disable_parallel_pages
 from .metadata_extractor import MetadataExtractor
 
-__all__ = ["TextExtractor", "MetadataExtractor"]
\ No newline at end of file
+__all__ = ["TextExtractor", "MetadataExtractor", "disable_parallel_pages"]
\ No newline at end of file
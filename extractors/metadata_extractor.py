@@ -3,28 +3,128 @@ Extractor de metadatos específicos de documentos
 """
 import re
 import logging
-from typing import Optional, List, Dict
+import threading
+from typing import Optional, List, Dict, Set
 from datetime import datetime
 from config import CUIT_PATTERN, DATE_PATTERNS, AMOUNT_PATTERN
 
 logger = logging.getLogger(__name__)
 
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+
+# Patrones precompilados al importar el módulo. Se evalúan por separado y en
+# orden (no como una sola alternancia) porque el primer patrón que coincide
+# tiene prioridad sobre la posición en el texto.
+_CUIT_RE = re.compile(CUIT_PATTERN)
+_DATE_RES = [re.compile(pattern, re.IGNORECASE) for pattern in DATE_PATTERNS]
+_AMOUNT_RE = re.compile(AMOUNT_PATTERN)
+
+# Patrones comunes para identificar proveedores
+_SUPPLIER_RES = [
+    re.compile(pattern, re.IGNORECASE) for pattern in (
+        r"Razón Social:?\s*([A-Z][A-Za-z\s&\.]{3,50})",
+        r"Proveedor:?\s*([A-Z][A-Za-z\s&\.]{3,50})",
+        r"Empresa:?\s*([A-Z][A-Za-z\s&\.]{3,50})",
+        r"^([A-Z][A-Za-z\s&\.]{10,50})\s*(S\.A\.|SRL|SA|LTDA)"
+    )
+]
+
+# Patrones para números de documento
+_DOC_NUMBER_RES = [
+    re.compile(pattern, re.IGNORECASE) for pattern in (
+        r"N[úu]mero:?\s*(\d+[-/]?\d*)",
+        r"N[°º]:?\s*(\d+[-/]?\d*)",
+        r"Factura N[°º]:?\s*(\d+[-/]?\d*)",
+        r"Remito N[°º]:?\s*(\d+[-/]?\d*)",
+        r"Documento N[°º]:?\s*(\d+[-/]?\d*)"
+    )
+]
+
+# Identificadores de cada patrón en la base de Hyperscan
+_CUIT_ID = 0
+_AMOUNT_ID = 1
+_DATE_IDS = range(2, 2 + len(_DATE_RES))
+_DOC_NUMBER_IDS = range(_DATE_IDS.stop, _DATE_IDS.stop + len(_DOC_NUMBER_RES))
+
+
+def _build_prefilter():
+    """
+    Compila los patrones de CUIT, montos, fechas y números de documento en una
+    única base de Hyperscan (None si Hyperscan no está disponible).
+    """
+    if not HYPERSCAN_AVAILABLE:
+        return None
+    
+    flags = hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP | hyperscan.HS_FLAG_SINGLEMATCH
+    expressions = [_CUIT_RE, _AMOUNT_RE, *_DATE_RES, *_DOC_NUMBER_RES]
+    try:
+        database = hyperscan.Database()
+        database.compile(
+            expressions=[regex.pattern.encode('utf-8') for regex in expressions],
+            ids=list(range(len(expressions))),
+            elements=len(expressions),
+            flags=[flags | hyperscan.HS_FLAG_CASELESS if regex.flags & re.IGNORECASE else flags
+                   for regex in expressions]
+        )
+        return database
+    except Exception as e:
+        logger.warning(f"No se pudo compilar el prefiltro de Hyperscan: {e}")
+        return None
+
+
+_PREFILTER_DB = _build_prefilter()
+_prefilter_local = threading.local()
+
+
+def _matching_pattern_ids(text: str) -> Optional[Set[int]]:
+    """
+    Recorre el texto una sola vez con Hyperscan y retorna los identificadores
+    de los patrones que tienen al menos una coincidencia.
+    
+    Es un prefiltro: los patrones que no coinciden se omiten y los demás se
+    evalúan luego con re para obtener exactamente los mismos resultados.
+    Retorna None si Hyperscan no está disponible.
+    """
+    if _PREFILTER_DB is None:
+        return None
+    
+    # El scratch de Hyperscan no se puede compartir entre hilos
+    scratch = getattr(_prefilter_local, "scratch", None)
+    if scratch is None:
+        scratch = _prefilter_local.scratch = hyperscan.Scratch(_PREFILTER_DB)
+    
+    matched = set()
+    
+    def on_match(pattern_id, start, end, flags, context):
+        matched.add(pattern_id)
+    
+    _PREFILTER_DB.scan(text.encode('utf-8', 'ignore'), match_event_handler=on_match, scratch=scratch)
+    return matched
+
 
 class MetadataExtractor:
     """Extrae metadatos específicos como CUIT, fechas, montos, etc."""
     
-    def extract_cuit(self, text: str) -> Optional[str]:
+    def extract_cuit(self, text: str, candidates: Optional[Set[int]] = None) -> Optional[str]:
         """
         Extrae CUIT del texto (formato 00-00000000-0)
         
         Args:
             text: Texto donde buscar el CUIT
+            candidates: Patrones con coincidencias según el prefiltro (opcional)
             
         Returns:
             CUIT encontrado o None
         """
+        if candidates is not None and _CUIT_ID not in candidates:
+            return None
+        
         try:
-            match = re.search(CUIT_PATTERN, text)
+            match = _CUIT_RE.search(text)
             if match:
                 cuit = match.group(0)
                 logger.debug(f"CUIT encontrado: {cuit}")
@@ -35,21 +135,22 @@ class MetadataExtractor:
             logger.error(f"Error extrayendo CUIT: {e}")
             return None
     
-    def extract_dates(self, text: str) -> List[str]:
+    def extract_dates(self, text: str, candidates: Optional[Set[int]] = None) -> List[str]:
         """
         Extrae fechas del texto usando múltiples patrones
         
         Args:
             text: Texto donde buscar fechas
+            candidates: Patrones con coincidencias según el prefiltro (opcional)
             
         Returns:
             Lista de fechas encontradas
         """
         dates = []
         try:
-            for pattern in DATE_PATTERNS:
-                matches = re.findall(pattern, text, re.IGNORECASE)
-                dates.extend(matches)
+            for pattern_id, date_re in zip(_DATE_IDS, _DATE_RES):
+                if candidates is None or pattern_id in candidates:
+                    dates.extend(date_re.findall(text))
                 
             # Remover duplicados manteniendo el orden
             unique_dates = list(dict.fromkeys(dates))
@@ -63,18 +164,22 @@ class MetadataExtractor:
             logger.error(f"Error extrayendo fechas: {e}")
             return []
     
-    def extract_amounts(self, text: str) -> List[str]:
+    def extract_amounts(self, text: str, candidates: Optional[Set[int]] = None) -> List[str]:
         """
         Extrae montos del texto
         
         Args:
             text: Texto donde buscar montos
+            candidates: Patrones con coincidencias según el prefiltro (opcional)
             
         Returns:
             Lista de montos encontrados
         """
+        if candidates is not None and _AMOUNT_ID not in candidates:
+            return []
+        
         try:
-            amounts = re.findall(AMOUNT_PATTERN, text)
+            amounts = _AMOUNT_RE.findall(text)
             
             if amounts:
                 logger.debug(f"Montos encontrados: {amounts}")
@@ -96,20 +201,12 @@ class MetadataExtractor:
             Nombre del proveedor o None
         """
         try:
-            lines = text.split('\n')[:10]  # Buscar en las primeras 10 líneas
-            
-            # Patrones comunes para identificar proveedores
-            supplier_patterns = [
-                r"Razón Social:?\s*([A-Z][A-Za-z\s&\.]{3,50})",
-                r"Proveedor:?\s*([A-Z][A-Za-z\s&\.]{3,50})",
-                r"Empresa:?\s*([A-Z][A-Za-z\s&\.]{3,50})",
-                r"^([A-Z][A-Za-z\s&\.]{10,50})\s*(S\.A\.|SRL|SA|LTDA)"
-            ]
+            lines = text.split('\n', 10)[:10]  # Buscar en las primeras 10 líneas
             
             for line in lines:
                 line = line.strip()
-                for pattern in supplier_patterns:
-                    match = re.search(pattern, line, re.IGNORECASE)
+                for supplier_re in _SUPPLIER_RES:
+                    match = supplier_re.search(line)
                     if match:
                         supplier = match.group(1).strip()
                         logger.debug(f"Proveedor encontrado: {supplier}")
@@ -121,28 +218,22 @@ class MetadataExtractor:
             logger.error(f"Error extrayendo proveedor: {e}")
             return None
     
-    def extract_document_number(self, text: str) -> Optional[str]:
+    def extract_document_number(self, text: str, candidates: Optional[Set[int]] = None) -> Optional[str]:
         """
         Extrae el número de documento (factura, remito, etc.)
         
         Args:
             text: Texto del documento
+            candidates: Patrones con coincidencias según el prefiltro (opcional)
             
         Returns:
             Número de documento o None
         """
         try:
-            # Patrones para números de documento
-            doc_patterns = [
-                r"N[úu]mero:?\s*(\d+[-/]?\d*)",
-                r"N[°º]:?\s*(\d+[-/]?\d*)",
-                r"Factura N[°º]:?\s*(\d+[-/]?\d*)",
-                r"Remito N[°º]:?\s*(\d+[-/]?\d*)",
-                r"Documento N[°º]:?\s*(\d+[-/]?\d*)"
-            ]
-            
-            for pattern in doc_patterns:
-                match = re.search(pattern, text, re.IGNORECASE)
+            for pattern_id, doc_number_re in zip(_DOC_NUMBER_IDS, _DOC_NUMBER_RES):
+                if candidates is not None and pattern_id not in candidates:
+                    continue
+                match = doc_number_re.search(text)
                 if match:
                     doc_number = match.group(1)
                     logger.debug(f"Número de documento encontrado: {doc_number}")
@@ -158,18 +249,27 @@ class MetadataExtractor:
         """
         Extrae todos los metadatos del texto
         
+        Con Hyperscan disponible, el texto se recorre una vez con todos los
+        patrones y solo se evalúan con re los que tienen coincidencias.
+        
         Args:
             text: Texto del documento
             
         Returns:
             Diccionario con todos los metadatos encontrados
         """
+        try:
+            candidates = _matching_pattern_ids(text)
+        except Exception as e:
+            logger.warning(f"Error en prefiltro de Hyperscan: {e}")
+            candidates = None
+        
         metadata = {
-            "cuit": self.extract_cuit(text),
-            "dates": self.extract_dates(text),
-            "amounts": self.extract_amounts(text),
+            "cuit": self.extract_cuit(text, candidates),
+            "dates": self.extract_dates(text, candidates),
+            "amounts": self.extract_amounts(text, candidates),
             "supplier": self.extract_supplier_name(text),
-            "document_number": self.extract_document_number(text),
+            "document_number": self.extract_document_number(text, candidates),
             "extraction_timestamp": datetime.now().isoformat()
         }
         
@@ -2,14 +2,121 @@
 Extractor de texto de documentos PDF
 """
 import fitz  # PyMuPDF
+import os
+import atexit
 import logging
-from typing import Optional, Dict
+import threading
+import multiprocessing
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, BrokenExecutor
+from typing import Optional, Dict, List
+from config import PERFORMANCE_CONFIG
 
 logger = logging.getLogger(__name__)
 
+# Cantidad mínima de páginas para repartir la extracción entre procesos. get_text()
+# tarda ~1 ms por página y el pool agrega ~7-10 ms fijos por documento (IPC y
+# apertura del PDF en cada worker), así que con pocas páginas es más lento
+PARALLEL_MIN_PAGES = 64
+
+_page_pool = None
+_page_pool_workers = 0
+_page_pool_lock = threading.Lock()
+_parallel_pages_enabled = True
+
+
+def _get_page_pool() -> ProcessPoolExecutor:
+    """
+    Retorna el pool de procesos compartido para extraer páginas (se crea una vez)
+    
+    Se usa "spawn" porque el pool puede crearse desde hilos (ThreadPool del
+    BatchProcessor, escritor de fondo, listeners de logging): un fork con otros
+    hilos activos puede heredar locks tomados y bloquearse.
+    """
+    global _page_pool, _page_pool_workers
+    with _page_pool_lock:
+        if _page_pool is None:
+            _page_pool_workers = PERFORMANCE_CONFIG.get("max_workers") or os.cpu_count()
+            _page_pool = ProcessPoolExecutor(
+                max_workers=_page_pool_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _page_pool
+
+
+def _shutdown_page_pool():
+    """Detiene el pool de extracción de páginas si fue creado"""
+    global _page_pool
+    with _page_pool_lock:
+        if _page_pool is not None:
+            _page_pool.shutdown(wait=True, cancel_futures=True)
+            _page_pool = None
+
+
+atexit.register(_shutdown_page_pool)
+
+
+def disable_parallel_pages():
+    """
+    Desactiva la extracción de páginas en procesos separados
+    
+    Para procesos que ya forman parte de un grupo de workers (p. ej. los workers
+    de Gunicorn/Uvicorn de la API): cada uno crearía su propio pool y se
+    sobresuscribirían las CPUs.
+    """
+    global _parallel_pages_enabled
+    _parallel_pages_enabled = False
+    _shutdown_page_pool()
+
+
+def _extract_page_range(file_path: str, start: int, stop: int) -> List[str]:
+    """Extrae el texto de las páginas [start, stop) abriendo el PDF en el proceso worker"""
+    with fitz.open(file_path) as doc:
+        return [doc[page_num].get_text() for page_num in range(start, stop)]
+
 
 class TextExtractor:
-    """Extrae texto de documentos PDF usando PyMuPDF"""
+    """
+    Extrae texto de documentos PDF usando PyMuPDF
+    
+    Si se indica file_path, el PDF se abre una sola vez y se reutiliza en
+    todas las llamadas sobre ese archivo hasta close() (o al salir del bloque
+    with):
+    
+        with TextExtractor(path) as extractor:
+            info = extractor.get_document_info(path)
+            text = extractor.extract_from_pdf(path)
+    """
+    
+    def __init__(self, file_path: str = None):
+        self.file_path = file_path
+        self._doc = fitz.open(file_path) if file_path else None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    @property
+    def document(self) -> Optional[fitz.Document]:
+        """Documento abierto por el constructor (None si no se indicó file_path)"""
+        return self._doc
+    
+    def close(self):
+        """Cierra el documento abierto por el constructor, si lo hay"""
+        if self._doc is not None:
+            self._doc.close()
+            self._doc = None
+    
+    @contextmanager
+    def _open(self, file_path: str):
+        """Usa el documento ya abierto si es el mismo archivo; si no, lo abre y lo cierra"""
+        if self._doc is not None and file_path == self.file_path:
+            yield self._doc
+        else:
+            with fitz.open(file_path) as doc:
+                yield doc
     
     def extract_from_pdf(self, file_path: str) -> Optional[str]:
         """
@@ -22,11 +129,33 @@ class TextExtractor:
             Texto extraído o None si hay error
         """
         try:
-            text = ""
-            with fitz.open(file_path) as doc:
-                for page_num, page in enumerate(doc):
-                    page_text = page.get_text()
-                    text += f"\n--- Página {page_num + 1} ---\n{page_text}"
+            page_texts = None
+            with self._open(file_path) as doc:
+                page_count = len(doc)
+                # Dentro de un proceso worker (p. ej. BatchProcessor) no se vuelve a
+                # paralelizar, ni cuando el documento ya está abierto por el constructor
+                if (page_count < PARALLEL_MIN_PAGES
+                        or doc is self._doc
+                        or not _parallel_pages_enabled
+                        or not PERFORMANCE_CONFIG.get("enable_parallel_processing", True)
+                        or multiprocessing.parent_process() is not None):
+                    page_texts = [page.get_text() for page in doc]
+            
+            if page_texts is None:
+                try:
+                    page_texts = self._extract_pages_parallel(file_path, page_count)
+                except Exception as e:
+                    logger.warning(f"Extracción paralela falló para {file_path}, se usa modo secuencial: {e}")
+                    # Un pool roto no se recupera: se descarta para recrearlo en el próximo uso
+                    if isinstance(e, BrokenExecutor):
+                        _shutdown_page_pool()
+                    with self._open(file_path) as doc:
+                        page_texts = [page.get_text() for page in doc]
+            
+            text = "".join(
+                f"\n--- Página {page_num + 1} ---\n{page_text}"
+                for page_num, page_text in enumerate(page_texts)
+            )
                     
             logger.info(f"Texto extraído exitosamente de {file_path}")
             return text.strip()
@@ -35,6 +164,32 @@ class TextExtractor:
             logger.error(f"Error extrayendo texto de {file_path}: {e}")
             return None
     
+    def _extract_pages_parallel(self, file_path: str, page_count: int) -> List[str]:
+        """
+        Extrae el texto de todas las páginas repartiendo rangos contiguos entre
+        los procesos del pool; cada proceso abre su propia copia del PDF.
+        
+        Args:
+            file_path: Ruta al archivo PDF
+            page_count: Cantidad de páginas del documento
+            
+        Returns:
+            Lista con el texto de cada página, en orden
+        """
+        pool = _get_page_pool()
+        workers = min(_page_pool_workers, page_count)
+        bounds = [page_count * i // workers for i in range(workers + 1)]
+        
+        futures = [
+            pool.submit(_extract_page_range, file_path, start, stop)
+            for start, stop in zip(bounds, bounds[1:])
+        ]
+        
+        page_texts = []
+        for future in futures:
+            page_texts.extend(future.result())
+        return page_texts
+    
     def extract_page_text(self, file_path: str, page_num: int) -> Optional[str]:
         """
         Extrae texto de una página específica
@@ -47,7 +202,7 @@ class TextExtractor:
             Texto de la página o None si hay error
         """
         try:
-            with fitz.open(file_path) as doc:
+            with self._open(file_path) as doc:
                 if page_num < len(doc):
                     page = doc[page_num]
                     text = page.get_text()
@@ -72,7 +227,7 @@ class TextExtractor:
             Diccionario con información del documento
         """
         try:
-            with fitz.open(file_path) as doc:
+            with self._open(file_path) as doc:
                 info = {
                     "page_count": len(doc),
                     "title": doc.metadata.get("title", ""),
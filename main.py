@@ -72,7 +72,9 @@ def main():
             return
         
         # Verificar si hay archivos PDF
-        pdf_files = [f for f in os.listdir(INPUT_DIR) if f.lower().endswith('.pdf')]
+        with os.scandir(INPUT_DIR) as it:
+            pdf_files = [entry.name for entry in it
+                         if entry.is_file() and entry.name.lower().endswith('.pdf')]
         if not pdf_files:
             print(f"\n📂 No se encontraron archivos PDF en: {INPUT_DIR}")
             print("💡 Coloca archivos PDF en la carpeta 'input_pdfs' y ejecuta nuevamente.")
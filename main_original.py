@@ -2,8 +2,15 @@ import os
 import re
 import fitz  # PyMuPDF
 import sqlite3
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
 
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
 # 📂 Rutas
 INPUT_DIR = "input_pdfs"
 OUTPUT_DIR = "output_pdfs"
@@ -11,10 +18,21 @@ DB_PATH = "db/documentos.db"
 
 
 # ------------------- DB -------------------
+def _connect():
+    """Abre la base de datos en modo WAL (las escrituras no bloquean a los lectores)."""
+    conn = sqlite3.connect(DB_PATH)
+    conn.executescript("""
+        PRAGMA journal_mode=WAL;
+        PRAGMA synchronous=NORMAL;
+        PRAGMA temp_store=MEMORY;
+    """)
+    return conn
+
+
 def init_db():
     """Inicializa la base de datos SQLite."""
     os.makedirs("db", exist_ok=True)
-    conn = sqlite3.connect(DB_PATH)
+    conn = _connect()
     cur = conn.cursor()
     cur.execute("""
         CREATE TABLE IF NOT EXISTS documentos (
@@ -33,16 +51,49 @@ def init_db():
 # ------------------- PDF -------------------
 def extract_text_from_pdf(path):
     """Extrae texto de un PDF usando PyMuPDF."""
-    text = ""
     with fitz.open(path) as doc:
-        for page in doc:
-            text += page.get_text()
-    return text
+        return "".join(page.get_text() for page in doc)
+
+
+# Palabras clave por categoría, en orden de prioridad
+CLASSIFICATION_KEYWORDS = [
+    ("factura", "facturas"),
+    ("remito", "remitos"),
+    ("nota de crédito", "notas_credito"),
+    ("nota de credito", "notas_credito"),
+    ("nota de débito", "notas_debito"),
+    ("nota de debito", "notas_debito"),
+    ("carta de porte", "cartas_porte"),
+]
+
+
+def _build_keyword_automaton():
+    """Construye el autómata Aho-Corasick con las palabras clave (None si no está disponible)."""
+    if not AHOCORASICK_AVAILABLE:
+        return None
+    automaton = ahocorasick.Automaton()
+    for priority, (keyword, category) in enumerate(CLASSIFICATION_KEYWORDS):
+        automaton.add_word(keyword, (priority, category))
+    automaton.make_automaton()
+    return automaton
+
+
+KEYWORD_AUTOMATON = _build_keyword_automaton()
 
 
 def classify_document(text):
     """Clasifica el documento según palabras clave."""
     t = text.lower()
+    if KEYWORD_AUTOMATON is not None:
+        # Una sola pasada sobre el texto; gana la palabra de mayor prioridad
+        best = None
+        for _, (priority, category) in KEYWORD_AUTOMATON.iter(t):
+            if best is None or priority < best[0]:
+                best = (priority, category)
+                if priority == 0:
+                    break
+        return best[1] if best else "desconocido"
+    
     if "factura" in t:
         return "facturas"
     elif "remito" in t:
@@ -66,7 +117,7 @@ def extract_cuit(text):
 # ------------------- DB Save -------------------
 def save_to_db(filename, tipo, cuit, proveedor=""):
     """Guarda metadatos en la base de datos."""
-    conn = sqlite3.connect(DB_PATH)
+    conn = _connect()
     cur = conn.cursor()
     cur.execute("""
         INSERT INTO documentos (filename, tipo, cuit, proveedor, fecha_procesado)
@@ -76,27 +127,51 @@ def save_to_db(filename, tipo, cuit, proveedor=""):
     conn.close()
 
 
-# ------------------- Procesamiento -------------------
-def process_pdf(file_path):
-    """Procesa un archivo PDF completo."""
+def save_many_to_db(rows):
+    """Guarda varias filas (filename, tipo, cuit, proveedor, fecha_procesado) en una sola transacción."""
+    conn = _connect()
+    conn.isolation_level = None  # Transacción explícita
     try:
-        text = extract_text_from_pdf(file_path)
-        tipo = classify_document(text)
-        cuit = extract_cuit(text)
+        conn.execute("BEGIN IMMEDIATE")
+        conn.executemany("""
+            INSERT INTO documentos (filename, tipo, cuit, proveedor, fecha_procesado)
+            VALUES (?, ?, ?, ?, ?)
+        """, rows)
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+
+
+# ------------------- Procesamiento -------------------
+def analyze_pdf(file_path):
+    """Extrae y clasifica un PDF sin modificar archivos ni la base (apto para procesos worker)."""
+    text = extract_text_from_pdf(file_path)
+    return classify_document(text), extract_cuit(text)
+
+
+def move_pdf(file_path, tipo, cuit):
+    """Mueve el PDF a la carpeta de su tipo y retorna la fila de metadatos a guardar."""
+    # Crear carpeta destino
+    dest_dir = os.path.join(OUTPUT_DIR, tipo)
+    os.makedirs(dest_dir, exist_ok=True)
 
-        # Crear carpeta destino
-        dest_dir = os.path.join(OUTPUT_DIR, tipo)
-        os.makedirs(dest_dir, exist_ok=True)
+    # Mover archivo
+    filename = os.path.basename(file_path)
+    dest_path = os.path.join(dest_dir, filename)
+    os.rename(file_path, dest_path)
 
-        # Mover archivo
-        filename = os.path.basename(file_path)
-        dest_path = os.path.join(dest_dir, filename)
-        os.rename(file_path, dest_path)
+    print(f"✅ {filename} → {tipo} | CUIT: {cuit if cuit else 'N/D'}")
+    return (filename, tipo, cuit, "", datetime.now().isoformat())
 
-        # Guardar metadatos
-        save_to_db(filename, tipo, cuit)
 
-        print(f"✅ {filename} → {tipo} | CUIT: {cuit if cuit else 'N/D'}")
+def process_pdf(file_path):
+    """Procesa un archivo PDF completo."""
+    try:
+        tipo, cuit = analyze_pdf(file_path)
+        save_many_to_db([move_pdf(file_path, tipo, cuit)])
 
     except Exception as e:
         print(f"❌ Error procesando {file_path}: {e}")
@@ -110,15 +185,33 @@ if __name__ == "__main__":
     if not os.path.exists(INPUT_DIR):
         print(f"⚠️ La carpeta {INPUT_DIR} no existe. Crea la carpeta y coloca PDFs.")
     else:
-        files = os.listdir(INPUT_DIR)
-        if not files:
+        with os.scandir(INPUT_DIR) as it:
+            entries = list(it)
+        if not entries:
             print(f"📂 No se encontraron archivos en {INPUT_DIR}")
         else:
-            for file in files:
-                path = os.path.join(INPUT_DIR, file)
-                if file.lower().endswith(".pdf"):
-                    process_pdf(path)
+            pdf_paths = []
+            for entry in entries:
+                if entry.is_file() and entry.name.lower().endswith(".pdf"):
+                    pdf_paths.append(entry.path)
                 else:
-                    print(f"⚠️ {file} no es un PDF válido")
+                    print(f"⚠️ {entry.name} no es un PDF válido")
+
+            # La extracción y clasificación corre en paralelo; mover archivos se
+            # hace en el proceso principal y los metadatos se guardan al final
+            # en una única transacción
+            pending = []
+            with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+                futures = {executor.submit(analyze_pdf, path): path for path in pdf_paths}
+                for future in as_completed(futures):
+                    path = futures[future]
+                    try:
+                        tipo, cuit = future.result()
+                        pending.append(move_pdf(path, tipo, cuit))
+                    except Exception as e:
+                        print(f"❌ Error procesando {path}: {e}")
+
+            if pending:
+                save_many_to_db(pending)
 
     print("🏁 Proceso finalizado.")
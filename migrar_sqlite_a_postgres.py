@@ -1,5 +1,6 @@
 import sqlite3
 import psycopg2
+from psycopg2.extras import execute_values
 
 # Configuración de conexión
 SQLITE_DB = 'db/documentos.db'
@@ -12,8 +13,8 @@ PG_DB = 'postgres'
 # Conexión a SQLite
 sqlite_conn = sqlite3.connect(SQLITE_DB)
 sqlite_cur = sqlite_conn.cursor()
+sqlite_cur.arraysize = 5000
 sqlite_cur.execute('SELECT * FROM documentos')
-rows = sqlite_cur.fetchall()
 columns = [desc[0] for desc in sqlite_cur.description]
 
 # Conexión a PostgreSQL
@@ -26,15 +27,20 @@ pg_conn = psycopg2.connect(
 )
 pg_cur = pg_conn.cursor()
 
-# Insertar datos en PostgreSQL
-for row in rows:
-    placeholders = ','.join(['%s'] * len(row))
-    sql = f"INSERT INTO documentos ({','.join(columns)}) VALUES ({placeholders})"
-    pg_cur.execute(sql, row)
+# Insertar datos en PostgreSQL en lotes: un INSERT multi-fila por cada
+# bloque leído de SQLite (sin cargar toda la tabla en memoria)
+sql = f"INSERT INTO documentos ({','.join(columns)}) VALUES %s"
+migrated = 0
+while True:
+    rows = sqlite_cur.fetchmany()
+    if not rows:
+        break
+    execute_values(pg_cur, sql, rows, page_size=len(rows))
+    migrated += len(rows)
 
 pg_conn.commit()
 
-print(f"Migrados {len(rows)} registros de documentos.")
+print(f"Migrados {migrated} registros de documentos.")
 
 # Cerrar conexiones
 sqlite_conn.close()
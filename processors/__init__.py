@@ -1,7 +1,7 @@
 """
 Módulo de procesadores para el agente PDF
 """
-from .document_processor import DocumentProcessor
-from .batch_processor import BatchProcessor
+from .document_processor import DocumentProcessor, preload_components
+from .batch_processor import BatchProcessor, disable_process_pool
 
-__all__ = ["DocumentProcessor", "BatchProcessor"]
\ No newline at end of file
+__all__ = ["DocumentProcessor", "BatchProcessor", "preload_components", "disable_process_pool"]
\ No newline at end of file
@@ -3,13 +3,85 @@ Procesador por lotes para múltiples documentos
 """
 import os
 import logging
-from typing import List, Dict
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Tuple, Iterator
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
 from processors.document_processor import DocumentProcessor
+from utils import start_worker_log_listener, configure_worker_logging, get_worker_context
 from config import INPUT_DIR, SUPPORTED_EXTENSIONS, MAX_FILE_SIZE_MB
 
 logger = logging.getLogger(__name__)
 
+# Extensiones soportadas en minúsculas (str.endswith acepta la tupla completa)
+_SUPPORTED_EXT_TUPLE = tuple(ext.lower() for ext in SUPPORTED_EXTENSIONS)
+
+# Cuántos archivos por worker se piden por adelantado al kernel
+PREFETCH_PER_WORKER = 2
+
+# Cada cuántos archivos se registra el progreso del lote
+PROGRESS_LOG_EVERY = 50
+
+# Cada cuántas filas pendientes se guardan en la base de datos durante un lote
+FLUSH_EVERY = 500
+
+# Campos de cada resultado que se conservan en el resumen del lote
+RESULT_SUMMARY_FIELDS = ("success", "filename", "error", "classification", "confidence", "destination")
+
+# Procesador de documentos de cada proceso worker (se crea una vez por proceso)
+_worker_processor = None
+
+# Si los lotes con ML o layout pueden usar un pool de procesos (ver disable_process_pool)
+_process_pool_enabled = True
+
+
+def disable_process_pool():
+    """
+    Hace que los lotes usen hilos en lugar de un pool de procesos
+    
+    Para procesos que ya forman parte de un grupo de workers (p. ej. los workers
+    de Gunicorn/Uvicorn de la API): cada uno crearía su propio pool de
+    max_workers procesos y se sobresuscribirían las CPUs.
+    """
+    global _process_pool_enabled
+    _process_pool_enabled = False
+
+
+def _init_worker(enable_ml: bool, enable_layout: bool, log_queue, log_level: int):
+    """
+    Inicializa el proceso worker cargando los clasificadores una sola vez
+    
+    Los registros del worker se envían por log_queue al proceso principal. El
+    worker no escribe en la base de datos, así que no abre conexiones.
+    """
+    global _worker_processor
+    configure_worker_logging(log_queue, log_level)
+    _worker_processor = DocumentProcessor(enable_ml=enable_ml, enable_layout=enable_layout,
+                                          init_database=False)
+    # Las filas se devuelven al proceso principal, que las guarda en un solo lote
+    _worker_processor.defer_saves = True
+
+
+def _prefetch(file_path: str):
+    """
+    Pide al kernel que lea el archivo en segundo plano (readahead asíncrono),
+    para que ya esté en la caché de páginas cuando se procese
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        fd = os.open(file_path, os.O_RDONLY)
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        finally:
+            os.close(fd)
+    except OSError as e:
+        logger.debug(f"No se pudo precargar {file_path}: {e}")
+
+
+def _worker_process(file_path: str) -> Tuple[Dict, List[Tuple]]:
+    """Procesa un documento con el procesador del worker (función top-level, serializable)"""
+    result = _worker_processor.process_document(file_path)
+    return result, _worker_processor.take_pending_rows()
+
 
 class BatchProcessor:
     """Procesador por lotes que maneja múltiples documentos"""
@@ -17,6 +89,8 @@ class BatchProcessor:
     def __init__(self, max_workers: int = 4, enable_ml: bool = True, enable_layout: bool = True):
         self.document_processor = DocumentProcessor(enable_ml=enable_ml, enable_layout=enable_layout)
         self.max_workers = max_workers
+        self.enable_ml = enable_ml
+        self.enable_layout = enable_layout
     
     def process_directory(self, input_dir: str = None) -> Dict:
         """
@@ -50,22 +124,37 @@ class BatchProcessor:
                 logger.warning(f"No se encontraron archivos PDF en {input_dir}")
                 return results
             
-            # Procesar archivos
+            # Procesar archivos a medida que terminan, guardando las filas por tandas
             if self.max_workers > 1:
-                results["results"] = self._process_parallel(pdf_files)
+                result_iter = self._iter_parallel(pdf_files)
             else:
-                results["results"] = self._process_sequential(pdf_files)
-            
-            # Calcular estadísticas
-            results["processed"] = sum(1 for r in results["results"] if r["success"])
-            results["errors"] = sum(1 for r in results["results"] if not r["success"])
+                result_iter = self._iter_sequential(pdf_files)
             
-            # Resumen por tipo de documento
             type_summary = {}
-            for result in results["results"]:
-                if result["success"]:
-                    doc_type = result["classification"]
-                    type_summary[doc_type] = type_summary.get(doc_type, 0) + 1
+            self.document_processor.defer_saves = True
+            self.document_processor.start_writer()
+            try:
+                for result in result_iter:
+                    # Estadísticas y resumen por tipo de documento
+                    if result["success"]:
+                        results["processed"] += 1
+                        doc_type = result["classification"]
+                        type_summary[doc_type] = type_summary.get(doc_type, 0) + 1
+                    else:
+                        results["errors"] += 1
+                    
+                    # Solo se conservan los campos livianos (sin el análisis de clasificación)
+                    results["results"].append({field: result.get(field) for field in RESULT_SUMMARY_FIELDS})
+                    
+                    if self.document_processor.pending_row_count() >= FLUSH_EVERY:
+                        self.document_processor.flush()
+            finally:
+                self.document_processor.defer_saves = False
+                try:
+                    # Guarda lo pendiente y espera al escritor (propaga su error, si lo hubo)
+                    self.document_processor.stop_writer()
+                finally:
+                    self._mark_failed_saves(results, type_summary)
             
             results["summary"] = type_summary
             
@@ -77,6 +166,34 @@ class BatchProcessor:
         
         return results
     
+    def _mark_failed_saves(self, results: Dict, type_summary: Dict):
+        """
+        Informa como errores los documentos procesados cuya fila no se pudo
+        guardar en la base de datos (el archivo ya fue organizado)
+        
+        Args:
+            results: Resultados del lote (se actualizan contadores y entradas)
+            type_summary: Resumen por tipo de documento (se descuentan los fallidos)
+        """
+        failed = dict(self.document_processor.take_failed_saves())
+        if not failed:
+            return
+        
+        for entry in results["results"]:
+            error = failed.pop(entry["filename"], None)
+            if error is None or not entry["success"]:
+                continue
+            
+            entry["success"] = False
+            entry["error"] = f"No se pudo guardar en BD (archivo en {entry['destination']}): {error}"
+            results["processed"] -= 1
+            results["errors"] += 1
+            
+            doc_type = entry["classification"]
+            type_summary[doc_type] -= 1
+            if not type_summary[doc_type]:
+                del type_summary[doc_type]
+    
     def _get_pdf_files(self, directory: str) -> List[str]:
         """
         Obtiene lista de archivos PDF válidos en el directorio
@@ -93,101 +210,159 @@ class BatchProcessor:
             logger.warning(f"Directorio no existe: {directory}")
             return pdf_files
         
-        for filename in os.listdir(directory):
-            file_path = os.path.join(directory, filename)
-            
-            # Verificar extensión
-            if not any(filename.lower().endswith(ext) for ext in SUPPORTED_EXTENSIONS):
-                logger.debug(f"Archivo ignorado (extensión no soportada): {filename}")
-                continue
-            
-            # Verificar que es un archivo
-            if not os.path.isfile(file_path):
-                continue
-            
-            # Verificar tamaño
-            file_size_mb = os.path.getsize(file_path) / (1024 * 1024)
-            if file_size_mb > MAX_FILE_SIZE_MB:
-                logger.warning(f"Archivo muy grande ({file_size_mb:.1f}MB): {filename}")
-                continue
-            
-            pdf_files.append(file_path)
-            logger.debug(f"Archivo PDF válido encontrado: {filename}")
+        # scandir reutiliza el tipo y el stat de cada entrada (menos syscalls)
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                filename = entry.name
+                
+                # Verificar extensión
+                if not filename.lower().endswith(_SUPPORTED_EXT_TUPLE):
+                    logger.debug(f"Archivo ignorado (extensión no soportada): {filename}")
+                    continue
+                
+                # Verificar que es un archivo regular: los enlaces simbólicos se
+                # ignoran (el lote mueve cada archivo a su carpeta de salida)
+                if not entry.is_file(follow_symlinks=False):
+                    continue
+                
+                # Verificar tamaño
+                file_size_mb = entry.stat(follow_symlinks=False).st_size / (1024 * 1024)
+                if file_size_mb > MAX_FILE_SIZE_MB:
+                    logger.warning(f"Archivo muy grande ({file_size_mb:.1f}MB): {filename}")
+                    continue
+                
+                pdf_files.append(entry.path)
+                logger.debug(f"Archivo PDF válido encontrado: {filename}")
         
         return pdf_files
     
-    def _process_sequential(self, file_paths: List[str]) -> List[Dict]:
+    def _iter_sequential(self, file_paths: List[str]) -> Iterator[Dict]:
         """
         Procesa archivos secuencialmente
         
         Args:
             file_paths: Lista de rutas de archivos
             
-        Returns:
-            Lista de resultados de procesamiento
+        Yields:
+            Resultado de procesamiento de cada archivo
         """
-        results = []
+        if file_paths:
+            _prefetch(file_paths[0])
         
+        total = len(file_paths)
         for i, file_path in enumerate(file_paths, 1):
-            logger.info(f"Procesando archivo {i}/{len(file_paths)}: {os.path.basename(file_path)}")
+            if i == 1 or i % PROGRESS_LOG_EVERY == 0:
+                logger.info("Procesando archivo %d/%d: %s", i, total, os.path.basename(file_path))
+            
+            # Leer el siguiente archivo mientras se procesa este
+            if i < len(file_paths):
+                _prefetch(file_paths[i])
             
             result = self.document_processor.process_document(file_path)
-            results.append(result)
             
-            # Log del resultado
+            # Log del resultado (los exitosos solo en modo debug)
             if result["success"]:
-                logger.info(f"✅ {result['filename']} → {result['classification']}")
+                logger.debug("✅ %s → %s", result["filename"], result["classification"])
             else:
-                logger.error(f"❌ {result['filename']}: {result['error']}")
-        
-        return results
+                logger.error("❌ %s: %s", result["filename"], result["error"])
+            
+            yield result
     
-    def _process_parallel(self, file_paths: List[str]) -> List[Dict]:
+    def _iter_parallel(self, file_paths: List[str]) -> Iterator[Dict]:
         """
-        Procesa archivos en paralelo
+        Procesa archivos en paralelo, entregando cada resultado apenas termina
+        
+        Con clasificación ML o de layout el trabajo es de CPU, por lo que se usa
+        un pool de procesos (cada worker carga sus clasificadores una vez); sin
+        ellos, o con el pool desactivado (disable_process_pool), se usan hilos.
         
         Args:
             file_paths: Lista de rutas de archivos
             
-        Returns:
-            Lista de resultados de procesamiento
+        Yields:
+            Resultado de procesamiento de cada archivo
         """
-        results = []
+        log_listener = None
+        if _process_pool_enabled and (self.enable_ml or self.enable_layout):
+            # forkserver o spawn, nunca fork (ver utils/process_pools.py)
+            context = get_worker_context()
+            log_queue, log_listener = start_worker_log_listener(context)
+            executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=(self.enable_ml, self.enable_layout, log_queue,
+                          logging.getLogger().getEffectiveLevel())
+            )
+            process_document = _worker_process
+            returns_rows = True
+        else:
+            executor = ThreadPoolExecutor(max_workers=self.max_workers)
+            process_document = self.document_processor.process_document
+            returns_rows = False
+        
+        try:
+            yield from self._collect_results(executor, process_document, returns_rows, file_paths)
+        finally:
+            # Después de cerrar el pool: los registros de los workers ya están en la cola
+            if log_listener is not None:
+                log_listener.stop()
+    
+    def _collect_results(self, executor, process_document, returns_rows: bool,
+                         file_paths: List[str]) -> Iterator[Dict]:
+        """Envía los archivos al executor y entrega cada resultado apenas termina"""
+        # Precargar los primeros archivos y luego uno más por cada resultado recibido
+        prefetch_window = self.max_workers * PREFETCH_PER_WORKER
+        for file_path in file_paths[:prefetch_window]:
+            _prefetch(file_path)
+        next_prefetch = prefetch_window
         
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+        with executor:
             # Enviar tareas
             future_to_file = {
-                executor.submit(self.document_processor.process_document, file_path): file_path
+                executor.submit(process_document, file_path): file_path
                 for file_path in file_paths
             }
             
             # Recoger resultados
-            for future in as_completed(future_to_file):
-                file_path = future_to_file[future]
+            total = len(file_paths)
+            for completed, future in enumerate(as_completed(future_to_file), 1):
+                if completed % PROGRESS_LOG_EVERY == 0:
+                    logger.info("Completados %d/%d archivos", completed, total)
+                
+                # Soltar el future para no retener su resultado hasta el final del lote
+                file_path = future_to_file.pop(future)
+                
+                if next_prefetch < len(file_paths):
+                    _prefetch(file_paths[next_prefetch])
+                    next_prefetch += 1
                 
                 try:
                     result = future.result()
-                    results.append(result)
+                    if returns_rows:
+                        result, rows = result
+                        self.document_processor.add_pending_rows(rows)
                     
                     if result["success"]:
-                        logger.info(f"✅ {result['filename']} → {result['classification']}")
+                        logger.debug("✅ %s → %s", result["filename"], result["classification"])
                     else:
-                        logger.error(f"❌ {result['filename']}: {result['error']}")
+                        logger.error("❌ %s: %s", result["filename"], result["error"])
                         
                 except Exception as e:
                     error_result = {
                         "success": False,
                         "filename": os.path.basename(file_path),
-                        "error": f"Error en hilo de ejecución: {e}",
+                        "error": f"Error en worker de ejecución: {e}",
                         "classification": None,
                         "confidence": 0.0,
                         "metadata": {},
                         "destination": None
                     }
-                    results.append(error_result)
                     logger.error(f"❌ Error procesando {os.path.basename(file_path)}: {e}")
-        
-        return results
+                    yield error_result
+                    continue
+                
+                yield result
     
     def process_single_file(self, file_path: str) -> Dict:
         """
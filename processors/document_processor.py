@@ -3,49 +3,178 @@ Procesador principal de documentos PDF con clasificación inteligente
 """
 import os
 import psycopg2
+import psycopg2.extras
+import psycopg2.pool
 import logging
 import json
-from datetime import datetime
-from typing import Optional, Dict
-from config import OUTPUT_DIR, DB_SCHEMA
+import queue
+import shutil
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, date
+from functools import lru_cache
+from typing import Optional, Dict, List, Tuple, Any
+from config import OUTPUT_DIR, DB_SCHEMA, PERFORMANCE_CONFIG
 from extractors import TextExtractor, MetadataExtractor
-from classifiers import IntelligentClassifier
+from classifiers import get_intelligent_classifier
 from validators import PDFValidator
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Columnas que se insertan por documento (en el orden de las filas pendientes)
+DOCUMENT_COLUMNS = (
+    "filename", "tipo", "cuit", "proveedor", "fecha_documento",
+    "monto", "confidence", "fecha_procesado", "proveedor_id",
+    "detalles_clasificacion"
+)
 
-class DocumentProcessor:
-    """Procesador principal que coordina la extracción, clasificación y almacenamiento"""
-    
-    def __init__(self, enable_ml: bool = True, enable_layout: bool = True):
-        self.text_extractor = TextExtractor()
-        self.metadata_extractor = MetadataExtractor()
-        self.intelligent_classifier = IntelligentClassifier(
-            enable_ml=enable_ml, 
-            enable_layout=enable_layout
-        )
-        self.pdf_validator = PDFValidator()
-        self._init_database()
+# Tandas de filas que pueden esperar al escritor en segundo plano antes de bloquear
+WRITE_QUEUE_SIZE = 4
+
+# Pool de conexiones del proceso actual (cada proceso worker crea el suyo)
+_POOL = None
+_POOL_PID = None
+_POOL_LOCK = threading.Lock()
+# Cupos del pool: getconn falla con PoolError si no hay conexiones libres, así
+# que quien pide una conexión espera acá hasta que otra se devuelva
+_POOL_SLOTS = None
+
+# Proceso en el que ya se creó el esquema (tabla e índices) de la base de datos
+_SCHEMA_READY_PID = None
+
+
+def _json_default(value: Any) -> Any:
+    """
+    Codifica los valores de la clasificación que JSON no soporta
     
-    def _init_database(self):
-        """Inicializa la base de datos SQLite"""
-        try:
+    Los escalares y arrays de numpy (p. ej. la confianza del clasificador ML)
+    se guardan como números y listas, igual con orjson que con json.
+    """
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def _get_pool() -> Tuple[psycopg2.pool.ThreadedConnectionPool, threading.BoundedSemaphore]:
+    """Retorna el pool de conexiones del proceso y sus cupos, creándolos en el primer uso"""
+    global _POOL, _POOL_PID, _POOL_SLOTS
+    with _POOL_LOCK:
+        # Las conexiones heredadas por fork no se pueden compartir con el padre
+        if _POOL is None or _POOL_PID != os.getpid():
             from config import PG_HOST, PG_PORT, PG_USER, PG_PASSWORD, PG_DB
-            conn = psycopg2.connect(
+            maxconn = max(PERFORMANCE_CONFIG.get("max_workers", 4), 1)
+            _POOL = psycopg2.pool.ThreadedConnectionPool(
+                minconn=1,
+                maxconn=maxconn,
                 host=PG_HOST,
                 port=PG_PORT,
                 user=PG_USER,
                 password=PG_PASSWORD,
                 dbname=PG_DB
             )
-            cur = conn.cursor()
-            
-            # Crear tabla con el esquema actualizado
-            cur.execute(DB_SCHEMA["documentos"])
-            conn.commit()
-            conn.close()
+            _POOL_SLOTS = threading.BoundedSemaphore(maxconn)
+            _POOL_PID = os.getpid()
+        return _POOL, _POOL_SLOTS
+
+
+@contextmanager
+def _pooled_connection():
+    """Toma una conexión del pool (esperando si están todas en uso) y la devuelve al terminar"""
+    pool, slots = _get_pool()
+    slots.acquire()
+    try:
+        conn = pool.getconn()
+        try:
+            yield conn
+        finally:
+            # putconn hace rollback de cualquier transacción que haya quedado abierta
+            pool.putconn(conn)
+    finally:
+        slots.release()
+
+
+@lru_cache(maxsize=1)
+def _get_stateless_components() -> Tuple[TextExtractor, MetadataExtractor, PDFValidator]:
+    """Retorna los extractores y el validador compartidos (no guardan estado por documento)"""
+    return TextExtractor(), MetadataExtractor(), PDFValidator()
+
+
+def preload_components(enable_ml: bool = True, enable_layout: bool = True):
+    """
+    Carga de antemano el clasificador y los extractores compartidos
+    
+    Útil antes de un fork (p. ej. Gunicorn con --preload): los procesos hijos
+    heredan los modelos y patrones ya compilados en memoria compartida.
+    """
+    _get_stateless_components()
+    get_intelligent_classifier(enable_ml=enable_ml, enable_layout=enable_layout)
+
+
+class DocumentProcessor:
+    """Procesador principal que coordina la extracción, clasificación y almacenamiento"""
+    
+    def __init__(self, enable_ml: bool = True, enable_layout: bool = True,
+                 init_database: bool = True):
+        """
+        Args:
+            enable_ml: Si usar el clasificador ML
+            enable_layout: Si usar el análisis de layout
+            init_database: Si crear el esquema de la base de datos; False para
+                procesadores que solo acumulan filas (p. ej. workers de un lote)
+        """
+        self.text_extractor, self.metadata_extractor, self.pdf_validator = _get_stateless_components()
+        self.intelligent_classifier = get_intelligent_classifier(enable_ml=enable_ml, enable_layout=enable_layout)
+        # Si es True, las filas se acumulan en _pending_rows hasta flush()
+        self.defer_saves = False
+        self._pending_rows: List[Tuple] = []
+        self._pending_lock = threading.Lock()
+        # Escritor en segundo plano (ver start_writer)
+        self._write_queue: Optional[queue.Queue] = None
+        self._writer_thread: Optional[threading.Thread] = None
+        self._writer_error: Optional[Exception] = None
+        # Documentos cuya fila no se pudo guardar: (filename, error)
+        self._failed_saves: List[Tuple[str, str]] = []
+        # Carpetas destino ya creadas en este proceso
+        self._created_dirs = set()
+        if init_database:
+            self._init_database()
+    
+    def _init_database(self):
+        """Inicializa la base de datos (una vez por proceso)"""
+        global _SCHEMA_READY_PID
+        if _SCHEMA_READY_PID == os.getpid():
+            return
+        
+        try:
+            with _pooled_connection() as conn:
+                cur = conn.cursor()
+                
+                # Crear tabla con el esquema actualizado
+                cur.execute(DB_SCHEMA["documentos"])
+                conn.commit()
+                
+                # Índices y extensiones son opcionales: sin privilegios para
+                # crearlos (p. ej. pg_trgm) se sigue sin ellos
+                for index_sql in DB_SCHEMA["documentos_indices"]:
+                    try:
+                        cur.execute(index_sql)
+                        conn.commit()
+                    except psycopg2.Error as e:
+                        conn.rollback()
+                        logger.warning(f"No se pudo aplicar '{index_sql}': {e}")
             
+            _SCHEMA_READY_PID = os.getpid()
             logger.info("Base de datos inicializada correctamente")
             
         except Exception as e:
@@ -75,13 +204,22 @@ class DocumentProcessor:
         try:
             logger.info(f"Iniciando procesamiento de {file_path}")
             
-            # 1. Validar archivo PDF
-            if not self.pdf_validator.validate_pdf(file_path):
+            # 1-2. Validar y extraer texto abriendo (y parseando) el PDF una sola vez
+            try:
+                extractor = TextExtractor(file_path)
+            except Exception:
+                # No se puede abrir: el validador registra el motivo (y la cuarentena si corresponde)
+                self.pdf_validator.validate_pdf(file_path)
                 result["error"] = "Archivo PDF inválido"
                 return result
             
-            # 2. Extraer texto
-            text = self.text_extractor.extract_from_pdf(file_path)
+            with extractor:
+                if not self.pdf_validator.validate_pdf(file_path, extractor.document):
+                    result["error"] = "Archivo PDF inválido"
+                    return result
+                
+                text = extractor.extract_from_pdf(file_path)
+            
             if not text:
                 result["error"] = "No se pudo extraer texto del PDF"
                 return result
@@ -134,30 +272,75 @@ class DocumentProcessor:
         """
         # Crear carpeta destino
         dest_dir = os.path.join(OUTPUT_DIR, doc_type)
-        os.makedirs(dest_dir, exist_ok=True)
+        if dest_dir not in self._created_dirs:
+            os.makedirs(dest_dir, exist_ok=True)
+            self._created_dirs.add(dest_dir)
         
         # Generar nombre de destino
         filename = os.path.basename(file_path)
         dest_path = os.path.join(dest_dir, filename)
         
-        # Si el archivo ya existe, agregar timestamp
-        if os.path.exists(dest_path):
-            name, ext = os.path.splitext(filename)
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"{name}_{timestamp}{ext}"
-            dest_path = os.path.join(dest_dir, filename)
+        # Mover archivo sin pisar otro: el link falla si el destino ya existe,
+        # así que no hace falta consultarlo antes (ni hay carrera entre workers)
+        while True:
+            try:
+                os.link(file_path, dest_path)
+            except FileExistsError:
+                dest_path = self._unique_dest_path(dest_dir, filename)
+                continue
+            except OSError:
+                # Sin hard links (otro dispositivo o sistema de archivos sin soporte)
+                dest_path = self._move_exclusive(file_path, dest_dir, filename)
+            else:
+                os.unlink(file_path)
+            break
         
-        # Mover archivo
-        os.rename(file_path, dest_path)
         logger.info(f"Archivo movido: {file_path} → {dest_path}")
         
         return dest_path
     
+    def _unique_dest_path(self, dest_dir: str, filename: str) -> str:
+        """Genera una ruta de destino con sufijo aleatorio para evitar colisiones"""
+        name, ext = os.path.splitext(filename)
+        return os.path.join(dest_dir, f"{name}_{uuid.uuid4().hex[:8]}{ext}")
+    
+    def _move_exclusive(self, file_path: str, dest_dir: str, filename: str) -> str:
+        """
+        Mueve el archivo reservando antes el nombre de destino con creación exclusiva
+        
+        Args:
+            file_path: Ruta original del archivo
+            dest_dir: Carpeta destino
+            filename: Nombre de archivo deseado
+            
+        Returns:
+            Ruta final del archivo
+        """
+        dest_path = os.path.join(dest_dir, filename)
+        while True:
+            try:
+                with open(dest_path, 'x'):
+                    pass
+                break
+            except FileExistsError:
+                dest_path = self._unique_dest_path(dest_dir, filename)
+        
+        try:
+            os.replace(file_path, dest_path)
+        except OSError:
+            # Distinto dispositivo: copiar y borrar el original
+            shutil.move(file_path, dest_path)
+        
+        return dest_path
+    
     def _save_to_database(self, filename: str, doc_type: str, confidence: float, 
                          metadata: Dict, classification_result: Dict = None):
         """
         Guarda la información del documento en la base de datos con datos de clasificación inteligente
         
+        Con defer_saves activo la fila queda pendiente hasta flush(); si no,
+        se inserta inmediatamente.
+        
         Args:
             filename: Nombre del archivo
             doc_type: Tipo de documento
@@ -166,16 +349,6 @@ class DocumentProcessor:
             classification_result: Resultado completo de la clasificación inteligente
         """
         try:
-            from config import PG_HOST, PG_PORT, PG_USER, PG_PASSWORD, PG_DB
-            conn = psycopg2.connect(
-                host=PG_HOST,
-                port=PG_PORT,
-                user=PG_USER,
-                password=PG_PASSWORD,
-                dbname=PG_DB
-            )
-            cur = conn.cursor()
-            
             # Extraer datos específicos de los metadatos
             cuit = metadata.get("cuit")
             supplier = metadata.get("supplier")
@@ -195,46 +368,192 @@ class DocumentProcessor:
                 supplier_info = classification_result.get("supplier_info", {})
                 supplier_id = supplier_info.get("supplier_id")
                 
-                # Función para convertir objetos no serializables
-                def safe_serialize(obj):
-                    if isinstance(obj, bool):
-                        return obj
-                    elif isinstance(obj, dict):
-                        return {k: safe_serialize(v) for k, v in obj.items()}
-                    elif isinstance(obj, list):
-                        return [safe_serialize(item) for item in obj]
-                    else:
-                        return str(obj) if obj is not None else None
-                
+                # El encoder llama a _json_default solo con los objetos que no sabe serializar
                 classification_data = {
-                    "method_results": safe_serialize(classification_result.get("method_results", {})),
-                    "decision_details": safe_serialize(classification_result.get("decision_details", {})),
-                    "consensus_analysis": safe_serialize(classification_result.get("consensus_analysis", {}))
+                    "method_results": classification_result.get("method_results", {}),
+                    "decision_details": classification_result.get("decision_details", {}),
+                    "consensus_analysis": classification_result.get("consensus_analysis", {})
                 }
                 
-                classification_details = json.dumps(classification_data, ensure_ascii=False, indent=2)
+                # JSON compacto: sin indentación ocupa varias veces menos en la BD
+                if ORJSON_AVAILABLE:
+                    classification_details = orjson.dumps(
+                        classification_data, default=_json_default,
+                        option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+                    ).decode()
+                else:
+                    classification_details = json.dumps(
+                        classification_data, ensure_ascii=False, separators=(",", ":"),
+                        default=_json_default
+                    )
             
-            cur.execute("""
-                INSERT INTO documentos (
-                    filename, tipo, cuit, proveedor, fecha_documento, 
-                    monto, confidence, fecha_procesado, proveedor_id, 
-                    detalles_clasificacion
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
+            row = (
                 filename, doc_type, cuit, supplier, doc_date,
                 amount, confidence, datetime.now().isoformat(),
                 supplier_id, classification_details
-            ))
-            
-            conn.commit()
-            conn.close()
+            )
             
-            logger.info(f"Documento guardado en BD: {filename}")
+            if self.defer_saves:
+                with self._pending_lock:
+                    self._pending_rows.append(row)
+                logger.debug(f"Documento pendiente de guardar en BD: {filename}")
+            else:
+                self._insert_rows([row])
+                logger.info(f"Documento guardado en BD: {filename}")
             
         except Exception as e:
             logger.error(f"Error guardando en BD: {e}")
             raise
     
+    def _insert_rows(self, rows: List[Tuple]):
+        """
+        Inserta filas de documentos en un solo INSERT multi-fila y una transacción
+        
+        Args:
+            rows: Filas con los valores de DOCUMENT_COLUMNS
+        """
+        with _pooled_connection() as conn:
+            cur = conn.cursor()
+            # El commit no espera el fsync del WAL (solo arriesga las últimas filas ante un corte);
+            # LOCAL lo limita a esta transacción y no queda en la conexión del pool
+            cur.execute("SET LOCAL synchronous_commit TO OFF")
+            psycopg2.extras.execute_values(
+                cur,
+                f"INSERT INTO documentos ({', '.join(DOCUMENT_COLUMNS)}) VALUES %s",
+                rows,
+                page_size=500
+            )
+            conn.commit()
+    
+    def _save_rows(self, rows: List[Tuple]) -> int:
+        """
+        Guarda una tanda de filas; si el INSERT conjunto falla, reintenta fila por
+        fila para no perder la tanda entera por un solo documento
+        
+        Las filas que fallan igual quedan en take_failed_saves().
+        
+        Args:
+            rows: Filas con los valores de DOCUMENT_COLUMNS
+            
+        Returns:
+            Cantidad de documentos guardados
+        """
+        try:
+            self._insert_rows(rows)
+            logger.info(f"{len(rows)} documentos guardados en BD")
+            return len(rows)
+        except Exception as e:
+            if len(rows) == 1:
+                failed = [(rows[0][0], str(e))]
+            else:
+                logger.warning(f"Error guardando {len(rows)} documentos en BD, se reintenta uno por uno: {e}")
+                failed = []
+                for row in rows:
+                    try:
+                        self._insert_rows([row])
+                    except Exception as row_error:
+                        failed.append((row[0], str(row_error)))
+        
+        for filename, error in failed:
+            logger.error(f"Error guardando en BD {filename}: {error}")
+        with self._pending_lock:
+            self._failed_saves.extend(failed)
+        
+        saved = len(rows) - len(failed)
+        if saved:
+            logger.info(f"{saved} documentos guardados en BD")
+        return saved
+    
+    def take_failed_saves(self) -> List[Tuple[str, str]]:
+        """Retorna y vacía los documentos (filename, error) cuya fila no se pudo guardar"""
+        with self._pending_lock:
+            failed, self._failed_saves = self._failed_saves, []
+        return failed
+    
+    def take_pending_rows(self) -> List[Tuple]:
+        """Retorna y vacía las filas pendientes de guardar"""
+        with self._pending_lock:
+            rows, self._pending_rows = self._pending_rows, []
+        return rows
+    
+    def add_pending_rows(self, rows: List[Tuple]):
+        """Agrega filas pendientes obtenidas de otro procesador (p. ej. un proceso worker)"""
+        with self._pending_lock:
+            self._pending_rows.extend(rows)
+    
+    def pending_row_count(self) -> int:
+        """Retorna la cantidad de filas pendientes de guardar"""
+        return len(self._pending_rows)
+    
+    def flush(self) -> int:
+        """
+        Guarda en la base de datos todas las filas pendientes
+        
+        Returns:
+            Cantidad de documentos guardados (o encolados, con el escritor activo);
+            los que fallan quedan en take_failed_saves()
+        """
+        rows = self.take_pending_rows()
+        if not rows:
+            return 0
+        
+        # Con el escritor activo la tanda se encola y se guarda en segundo plano
+        if self._write_queue is not None:
+            self._write_queue.put(rows)
+            return len(rows)
+        
+        return self._save_rows(rows)
+    
+    def start_writer(self):
+        """
+        Inicia un hilo que guarda en la BD las tandas de flush(), para que el
+        procesamiento no espere a la base de datos
+        """
+        if self._writer_thread is not None:
+            return
+        
+        self._writer_error = None
+        self._write_queue = queue.Queue(maxsize=WRITE_QUEUE_SIZE)
+        self._writer_thread = threading.Thread(
+            target=self._writer_loop, name="document-db-writer", daemon=True
+        )
+        self._writer_thread.start()
+    
+    def stop_writer(self):
+        """
+        Guarda las filas pendientes, espera a que el escritor termine y lo detiene
+        
+        Raises:
+            Exception: El primer error que haya tenido el escritor
+        """
+        if self._writer_thread is None:
+            return
+        
+        try:
+            self.flush()
+        finally:
+            self._write_queue.put(None)
+            self._writer_thread.join()
+            self._write_queue = None
+            self._writer_thread = None
+        
+        if self._writer_error is not None:
+            raise self._writer_error
+    
+    def _writer_loop(self):
+        """Guarda las tandas encoladas hasta recibir None"""
+        while True:
+            rows = self._write_queue.get()
+            if rows is None:
+                break
+            
+            try:
+                self._save_rows(rows)
+            except Exception as e:
+                logger.error(f"Error guardando {len(rows)} documentos en BD: {e}")
+                if self._writer_error is None:
+                    self._writer_error = e
+    
     def get_processing_stats(self) -> Dict:
         """
         Obtiene estadísticas de procesamiento
@@ -243,29 +562,20 @@ class DocumentProcessor:
             Diccionario con estadísticas
         """
         try:
-            from config import PG_HOST, PG_PORT, PG_USER, PG_PASSWORD, PG_DB
-            conn = psycopg2.connect(
-                host=PG_HOST,
-                port=PG_PORT,
-                user=PG_USER,
-                password=PG_PASSWORD,
-                dbname=PG_DB
-            )
-            cur = conn.cursor()
-            
-            # Total de documentos
-            cur.execute("SELECT COUNT(*) FROM documentos")
-            total_docs = cur.fetchone()[0]
-            
-            # Documentos por tipo
-            cur.execute("SELECT tipo, COUNT(*) FROM documentos GROUP BY tipo")
-            docs_by_type = dict(cur.fetchall())
-            
-            # Confianza promedio
-            cur.execute("SELECT AVG(confidence) FROM documentos")
-            avg_confidence = cur.fetchone()[0] or 0
-            
-            conn.close()
+            with _pooled_connection() as conn:
+                cur = conn.cursor()
+                
+                # Total de documentos
+                cur.execute("SELECT COUNT(*) FROM documentos")
+                total_docs = cur.fetchone()[0]
+                
+                # Documentos por tipo
+                cur.execute("SELECT tipo, COUNT(*) FROM documentos GROUP BY tipo")
+                docs_by_type = dict(cur.fetchall())
+                
+                # Confianza promedio
+                cur.execute("SELECT AVG(confidence) FROM documentos")
+                avg_confidence = cur.fetchone()[0] or 0
             
             stats = {
                 "total_documents": total_docs,
@@ -1,38 +1,77 @@
 import psycopg2
 import sys
+from config import PG_HOST, PG_PORT, PG_USER, PG_PASSWORD, PG_DB
 
 DB_PATH = "db/documentos.db"
 
 
+# Conexión reutilizada entre búsquedas y consultas ya preparadas en ella
+_conn = None
+_prepared = set()
+
+SEARCH_COLUMNS = "id, filename, tipo, cuit, proveedor, fecha_procesado"
+
+# Condición de cada filtro (en orden); %d es el número de parámetro de PREPARE
+SEARCH_CONDITIONS = (
+    ("cuit", "cuit = $%d"),
+    ("proveedor", "proveedor LIKE $%d"),
+    ("tipo", "tipo = $%d"),
+)
+
+
+def _get_connection():
+    """Retorna la conexión de búsqueda, abriéndola en el primer uso"""
+    global _conn
+    if _conn is None or _conn.closed:
+        _conn = psycopg2.connect(
+            host=PG_HOST,
+            port=PG_PORT,
+            user=PG_USER,
+            password=PG_PASSWORD,
+            dbname=PG_DB
+        )
+        # Solo lectura: sin transacción abierta entre búsquedas
+        _conn.autocommit = True
+        # Las consultas preparadas pertenecen a la conexión anterior
+        _prepared.clear()
+    return _conn
+
+
+def _prepare_search(cur, fields):
+    """
+    Prepara en el servidor la consulta para la combinación de filtros dada
+    
+    Cada combinación se prepara una sola vez por conexión; las búsquedas
+    siguientes solo la ejecutan (sin volver a parsearla ni planificarla).
+    
+    Returns:
+        Nombre de la consulta preparada
+    """
+    name = "buscar_documentos_" + ("_".join(fields) or "todos")
+    if name not in _prepared:
+        conditions = [condition for field, condition in SEARCH_CONDITIONS if field in fields]
+        conditions = [condition % number for number, condition in enumerate(conditions, 1)]
+        query = f"SELECT {SEARCH_COLUMNS} FROM documentos"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        cur.execute(f"PREPARE {name} AS {query}")
+        _prepared.add(name)
+    return name
+
+
 def search_documents(cuit=None, proveedor=None, tipo=None):
-    from config import PG_HOST, PG_PORT, PG_USER, PG_PASSWORD, PG_DB
-    conn = psycopg2.connect(
-        host=PG_HOST,
-        port=PG_PORT,
-        user=PG_USER,
-        password=PG_PASSWORD,
-        dbname=PG_DB
-    )
-    cur = conn.cursor()
-
-    query = "SELECT id, filename, tipo, cuit, proveedor, fecha_procesado FROM documentos WHERE 1=1"
-    params = []
-
-    if cuit:
-        query += " AND cuit = ?"
-    from config import PG_HOST, PG_PORT, PG_USER, PG_PASSWORD, PG_DB
-
-    if proveedor:
-        query += " AND proveedor LIKE ?"
-        params.append(f"%{proveedor}%")
-
-    if tipo:
-        query += " AND tipo = ?"
-        params.append(tipo)
-
-    cur.execute(query, params)
+    values = {"cuit": cuit, "proveedor": f"%{proveedor}%" if proveedor else None, "tipo": tipo}
+    fields = [field for field, _ in SEARCH_CONDITIONS if values[field]]
+    params = [values[field] for field in fields]
+
+    cur = _get_connection().cursor()
+    name = _prepare_search(cur, fields)
+    if params:
+        cur.execute(f"EXECUTE {name} ({', '.join(['%s'] * len(params))})", params)
+    else:
+        cur.execute(f"EXECUTE {name}")
     rows = cur.fetchall()
-    conn.close()
+    cur.close()
 
     if rows:
         print("📑 Resultados encontrados:")
@@ -1,41 +1,94 @@
 """
 Servidor web para Agente Clasificador PDF - Versión Simplificada
+
+Por defecto se inicia con Gunicorn y varios workers de Uvicorn (la clasificación
+usa CPU y un solo proceso queda limitado por el GIL). Con --dev, o si Gunicorn no
+está disponible (p. ej. en Windows), se usa un único proceso de Uvicorn.
 """
 import os
 import sys
+import shutil
+import importlib.util
 import uvicorn
 
 # Agregar el directorio padre al path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+HOST = "0.0.0.0"
+PORT = 8001
+
+# Log de accesos por request (tiene costo); se activa con WEB_ACCESS_LOG=1
+ACCESS_LOG = os.environ.get("WEB_ACCESS_LOG", "0") == "1"
+
+# Workers de Gunicorn (WEB_WORKERS los fija). La clasificación usa CPU, así que
+# por defecto hay uno por CPU hasta un máximo; más workers solo compiten entre sí
+MAX_DEFAULT_WORKERS = 8
+
+
+def gunicorn_workers() -> int:
+    """Cantidad de workers de Gunicorn: WEB_WORKERS o una por CPU (hasta MAX_DEFAULT_WORKERS)"""
+    if os.environ.get("WEB_WORKERS"):
+        return max(int(os.environ["WEB_WORKERS"]), 1)
+    return min(os.cpu_count() or 1, MAX_DEFAULT_WORKERS)
+
+
+def run_gunicorn():
+    """Reemplaza el proceso actual por Gunicorn con workers de Uvicorn"""
+    workers = gunicorn_workers()
+    print(f"⚙️  Gunicorn con {workers} workers")
+    os.execvp("gunicorn", [
+        "gunicorn", "web_api.main:app",
+        "-k", "uvicorn_worker.UvicornWorker",
+        "-w", str(workers),
+        "--bind", f"{HOST}:{PORT}",
+        "--keep-alive", "5",
+        "--timeout", "60",
+        "--preload",
+        "--chdir", os.path.dirname(os.path.abspath(__file__))
+    ] + (["--access-logfile", "-"] if ACCESS_LOG else []))
+
+
 def main():
     """Función principal para iniciar el servidor"""
     print("🤖 Agente Clasificador PDF - Servidor Web v3.0")
     print("=" * 60)
-    print(f"🌐 Panel de control: http://localhost:8001")
-    print(f"📖 API Docs: http://localhost:8001/api/docs")
-    print(f"🔧 ReDoc: http://localhost:8001/api/redoc")
+    print(f"🌐 Panel de control: http://localhost:{PORT}")
+    print(f"📖 API Docs: http://localhost:{PORT}/api/docs")
+    print(f"🔧 ReDoc: http://localhost:{PORT}/api/redoc")
     print("=" * 60)
     print("Presiona Ctrl+C para detener el servidor")
     
     try:
-        # Importar la aplicación
-        from web_api.main import app
+        if ("--dev" not in sys.argv and shutil.which("gunicorn")
+                and importlib.util.find_spec("uvicorn_worker") is not None):
+            run_gunicorn()
+        
+        # Con varios workers uvicorn necesita la app como cadena de importación
+        workers = int(os.environ.get("WEB_WORKERS", 1))
+        if workers > 1:
+            app = "web_api.main:app"
+        else:
+            # Importar la aplicación
+            from web_api.main import app
         
-        # Iniciar servidor
+        # Iniciar servidor (loop uvloop y parser HTTP en C si están instalados)
         uvicorn.run(
             app,
-            host="0.0.0.0",
-            port=8001,
+            host=HOST,
+            port=PORT,
+            workers=workers,
+            loop="uvloop" if importlib.util.find_spec("uvloop") else "auto",
+            http="httptools" if importlib.util.find_spec("httptools") else "auto",
             log_level="info",
-            access_log=True
+            access_log=ACCESS_LOG
         )
     except ImportError as e:
         print(f"❌ Error de importación: {e}")
         print("💡 Asegúrate de que todas las dependencias estén instaladas:")
-        print("   pip install fastapi uvicorn")
+        print("   pip install fastapi uvicorn gunicorn uvicorn-worker httptools")
+        print("   pip install uvloop  # excepto en Windows")
     except Exception as e:
         print(f"❌ Error iniciando servidor: {e}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -5,12 +5,13 @@ import sys
 import os
 import json
 from datetime import datetime
+from itertools import islice
 
 # Agregar el directorio raíz al path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from classifiers.commercial_classifier import CommercialDocumentClassifier
-from classifiers.intelligent_classifier import IntelligentClassifier
+from classifiers.intelligent_classifier import get_intelligent_classifier
 
 
 def test_commercial_classifier():
@@ -177,32 +178,35 @@ def test_commercial_classifier():
         print(f"Confianza: {confidence:.3f}")
         print(f"Es documento comercial: {confidence > 0.3}")
         
+        # Detalles de la clasificación (se leen una sola vez)
+        terms_found = details.get("commercial_terms_found") or ()
+        patterns_found = details.get("patterns_found") or {}
+        indicators = details.get("specific_indicators") or {}
+        commercial_indicators = details.get("commercial_indicators") or {}
+        
         # Mostrar términos comerciales encontrados
-        if details.get("commercial_terms_found"):
-            print(f"Términos comerciales: {', '.join(details['commercial_terms_found'][:5])}")
+        if terms_found:
+            print(f"Términos comerciales: {', '.join(islice(terms_found, 5))}")
         
         # Mostrar patrones encontrados
-        patterns_found = details.get("patterns_found", {})
-        if patterns_found:
-            for pattern_type, patterns in patterns_found.items():
-                if patterns:
-                    print(f"Patrones {pattern_type}: {len(patterns)} encontrados")
+        for pattern_type, patterns in patterns_found.items():
+            if patterns:
+                print(f"Patrones {pattern_type}: {len(patterns)} encontrados")
         
         # Mostrar indicadores específicos
-        indicators = details.get("specific_indicators", {})
-        if indicators:
-            for indicator_type, elements in indicators.items():
-                print(f"Indicadores {indicator_type}: {', '.join(elements)}")
+        for indicator_type, elements in indicators.items():
+            print(f"Indicadores {indicator_type}: {', '.join(elements)}")
         
         # Extraer información comercial
-        commercial_indicators = details.get("commercial_indicators", {})
-        if commercial_indicators:
-            if commercial_indicators.get("amounts_found"):
-                print(f"Importes: {', '.join(commercial_indicators['amounts_found'][:3])}")
-            if commercial_indicators.get("banks_mentioned"):
-                print(f"Bancos: {', '.join(commercial_indicators['banks_mentioned'][:2])}")
-            if commercial_indicators.get("payment_methods"):
-                print(f"Métodos de pago: {', '.join(commercial_indicators['payment_methods'])}")
+        amounts = commercial_indicators.get("amounts_found")
+        banks = commercial_indicators.get("banks_mentioned")
+        payment_methods = commercial_indicators.get("payment_methods")
+        if amounts:
+            print(f"Importes: {', '.join(islice(amounts, 3))}")
+        if banks:
+            print(f"Bancos: {', '.join(islice(banks, 2))}")
+        if payment_methods:
+            print(f"Métodos de pago: {', '.join(payment_methods)}")
 
 
 def test_intelligent_classifier_commercial():
@@ -212,7 +216,7 @@ def test_intelligent_classifier_commercial():
     print("=" * 50)
     
     # Inicializar clasificador inteligente con soporte comercial
-    intelligent_classifier = IntelligentClassifier(enable_commercial=True)
+    intelligent_classifier = get_intelligent_classifier(enable_commercial=True)
     
     # Documento de prueba
     test_text = """
@@ -3,16 +3,20 @@
 Test completo de clasificadores especializados.
 """
 
+import os
 import sys
-sys.path.append('.')
 
-from classifiers.intelligent_classifier import IntelligentClassifier
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
+
+from classifiers.intelligent_classifier import get_intelligent_classifier
 
 def test_comprehensive():
     print("🎯 TEST COMPLETO DE CLASIFICADORES ESPECIALIZADOS")
     print("=" * 60)
     
-    classifier = IntelligentClassifier()
+    classifier = get_intelligent_classifier()
     
     # Casos de prueba variados
     test_cases = [
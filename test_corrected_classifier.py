@@ -2,10 +2,10 @@
 Script para reprocesat el documento con el clasificador inteligente corregido
 """
 import sys
-import os
+from pathlib import Path
 sys.path.append('.')
 
-from classifiers.intelligent_classifier import IntelligentClassifier
+from classifiers.intelligent_classifier import get_intelligent_classifier
 from extractors.text_extractor import TextExtractor
 
 def test_corrected_classifier():
@@ -15,12 +15,7 @@ def test_corrected_classifier():
     print("=" * 50)
     
     # Buscar el archivo PDF
-    pdf_path = None
-    for root, dirs, files in os.walk('output_pdfs'):
-        for file in files:
-            if 'liquidacionDebitoCredito' in file:
-                pdf_path = os.path.join(root, file)
-                break
+    pdf_path = next(Path('output_pdfs').rglob('*liquidacionDebitoCredito*'), None)
     
     if not pdf_path:
         print("❌ Archivo no encontrado")
@@ -33,7 +28,7 @@ def test_corrected_classifier():
     text = extractor.extract_from_pdf(pdf_path)
     
     # Clasificar con el clasificador inteligente corregido
-    intelligent_classifier = IntelligentClassifier(enable_agro=True)
+    intelligent_classifier = get_intelligent_classifier(enable_agro=True)
     result = intelligent_classifier.classify_document(text)
     
     print(f"\n🎯 RESULTADO FINAL:")
@@ -1,38 +1,50 @@
 import psycopg2
-import os
-''
 
 print("🔍 Diagnóstico de la base de datos")
 
-    try:
-        from config import PG_HOST, PG_PORT, PG_USER, PG_PASSWORD, PG_DB
-        conn = psycopg2.connect(
-            host=PG_HOST,
-            port=PG_PORT,
-            user=PG_USER,
-            password=PG_PASSWORD,
-            dbname=PG_DB
-        )
-        cursor = conn.cursor()
-        
-        # Verificar tablas
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
-        tables = cursor.fetchall()
-        print(f"📊 Tablas encontradas: {tables}")
-        
-        # Verificar estructura de la tabla documentos
-        if ('documentos',) in tables:
-            cursor.execute("PRAGMA table_info(documentos);")
-            columns = cursor.fetchall()
-            print(f"🏗️ Columnas de documentos: {columns}")
-            
-            # Contar registros
-            cursor.execute("SELECT COUNT(*) FROM documentos;")
-            count = cursor.fetchone()[0]
-            print(f"📈 Registros en documentos: {count}")
-        
-        conn.close()
-        print("✅ Conexión exitosa")
-        
-    except Exception as e:
-        print(f"❌ Error: {e}")
+try:
+    from config import PG_HOST, PG_PORT, PG_USER, PG_PASSWORD, PG_DB
+    conn = psycopg2.connect(
+        host=PG_HOST,
+        port=PG_PORT,
+        user=PG_USER,
+        password=PG_PASSWORD,
+        dbname=PG_DB
+    )
+    cursor = conn.cursor()
+
+    # Tablas del esquema público con su cantidad estimada de registros
+    # (reltuples evita el COUNT(*), que recorre toda la tabla)
+    cursor.execute("""
+        SELECT c.relname, c.reltuples::bigint
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = 'public' AND c.relkind = 'r'
+        ORDER BY c.relname;
+    """)
+    tables = dict(cursor.fetchall())
+    print(f"📊 Tablas encontradas: {list(tables)}")
+
+    # Verificar estructura de la tabla documentos
+    if 'documentos' in tables:
+        cursor.execute("""
+            SELECT column_name, data_type
+            FROM information_schema.columns
+            WHERE table_schema = 'public' AND table_name = 'documentos'
+            ORDER BY ordinal_position;
+        """)
+        columns = cursor.fetchall()
+        print(f"🏗️ Columnas de documentos: {columns}")
+
+        # reltuples es -1 si la tabla todavía no fue analizada
+        count = tables['documentos']
+        if count < 0:
+            print("📈 Registros en documentos: sin estimación (ejecutar ANALYZE documentos)")
+        else:
+            print(f"📈 Registros en documentos (estimado): {count}")
+
+    conn.close()
+    print("✅ Conexión exitosa")
+
+except Exception as e:
+    print(f"❌ Error: {e}")
@@ -6,14 +6,14 @@ Test de debug del clasificador comercial.
 import sys
 sys.path.append('.')
 
-from classifiers.intelligent_classifier import IntelligentClassifier
+from classifiers.intelligent_classifier import get_intelligent_classifier
 
 def test_debug():
     print("🔍 Iniciando test de debug del clasificador comercial...")
     
     # Crear clasificador inteligente
     try:
-        classifier = IntelligentClassifier()
+        classifier = get_intelligent_classifier()
         print("✅ Clasificador inteligente creado exitosamente")
         
         # Verificar pesos
@@ -7,7 +7,7 @@ import sys
 sys.path.append('.')
 
 from classifiers.commercial_classifier import CommercialDocumentClassifier
-from classifiers.intelligent_classifier import IntelligentClassifier
+from classifiers.intelligent_classifier import get_intelligent_classifier
 
 def test_notas_credito_debito():
     print("🔍 TEST DE NOTAS DE CRÉDITO Y DÉBITO")
@@ -15,7 +15,7 @@ def test_notas_credito_debito():
     
     # Crear clasificadores
     commercial_classifier = CommercialDocumentClassifier()
-    intelligent_classifier = IntelligentClassifier()
+    intelligent_classifier = get_intelligent_classifier()
     
     # Casos de prueba
     test_cases = [
@@ -90,11 +90,12 @@ def test_notas_credito_debito():
     
     intelligent_success = 0
     
-    for i, case in enumerate(test_cases, 1):
+    # Clasificación inteligente (incluye comercial) de todos los casos en un lote
+    results = intelligent_classifier.classify_documents([case['text'] for case in test_cases])
+    
+    for i, (case, result) in enumerate(zip(test_cases, results), 1):
         print(f"\n📄 Test {i}: {case['description']}")
         
-        # Clasificación inteligente (incluye comercial)
-        result = intelligent_classifier.classify_document(case['text'])
         classification = result['final_classification']
         confidence = result['final_confidence']
         
@@ -4,12 +4,12 @@ Test simple del clasificador inteligente con comercial
 import sys
 sys.path.append('.')
 
-from classifiers.intelligent_classifier import IntelligentClassifier
+from classifiers.intelligent_classifier import get_intelligent_classifier
 
 def test_simple():
     try:
         # Crear clasificador con todos los métodos habilitados
-        classifier = IntelligentClassifier(
+        classifier = get_intelligent_classifier(
             enable_ml=True, 
             enable_layout=True, 
             enable_agro=True, 
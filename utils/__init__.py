@@ -5,14 +5,20 @@ from .advanced_logging import (
     setup_advanced_logging,
     get_logger,
     log_system_info,
+    start_worker_log_listener,
+    configure_worker_logging,
     PerformanceLogger,
     ClassificationLogger
 )
+from .process_pools import get_worker_context
 
 __all__ = [
     "setup_advanced_logging",
     "get_logger", 
     "log_system_info",
+    "start_worker_log_listener",
+    "configure_worker_logging",
     "PerformanceLogger",
-    "ClassificationLogger"
+    "ClassificationLogger",
+    "get_worker_context"
 ]
\ No newline at end of file
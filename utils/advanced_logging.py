@@ -3,24 +3,77 @@ Sistema de logging avanzado para el agente PDF
 """
 import os
 import sys
+import copy
 import json
+import time
+import queue
+import atexit
 import logging
 import logging.handlers
-from datetime import datetime
-from typing import Dict, Any, Optional
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional, Tuple
 from pathlib import Path
 from config import LOGGING_CONFIG
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Campos extra conocidos, en el orden en que se emiten
+_EXTRA_KEYS = ('document_id', 'document_type', 'confidence', 'processing_time', 'method_results')
+_EXTRA_KEY_SET = frozenset(_EXTRA_KEYS)
+
+
+def _json_default(value: Any) -> Any:
+    """
+    Codifica los tipos que aparecen en los extras y que JSON no soporta
+    
+    Mantiene números y colecciones como tales en lugar de pasarlos a str,
+    con la misma salida para orjson y para json.
+    """
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    # Escalares y arrays de numpy (confianzas del clasificador ML)
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    return str(value)
+
 
 class StructuredFormatter(logging.Formatter):
     """
     Formateador que genera logs estructurados en formato JSON
     """
     
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Último segundo formateado; los registros del mismo segundo lo reutilizan
+        self._last_sec = -1
+        self._last_str = ''
+    
+    def _format_timestamp(self, created: float) -> str:
+        """Equivalente a datetime.fromtimestamp(created).isoformat() con caché por segundo"""
+        sec = int(created)
+        micros = round((created - sec) * 1e6)
+        if micros >= 1000000:
+            sec += 1
+            micros -= 1000000
+        
+        if sec != self._last_sec:
+            self._last_str = time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(sec))
+            self._last_sec = sec
+        
+        if micros:
+            return f"{self._last_str}.{micros:06d}"
+        return self._last_str
+    
     def format(self, record):
         """Formatea el registro como JSON estructurado"""
         log_entry = {
-            "timestamp": datetime.fromtimestamp(record.created).isoformat(),
+            "timestamp": self._format_timestamp(record.created),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -30,25 +83,22 @@ class StructuredFormatter(logging.Formatter):
         }
         
         # Agregar información adicional si está disponible
-        if hasattr(record, 'document_id'):
-            log_entry["document_id"] = record.document_id
-        
-        if hasattr(record, 'document_type'):
-            log_entry["document_type"] = record.document_type
-        
-        if hasattr(record, 'confidence'):
-            log_entry["confidence"] = record.confidence
-        
-        if hasattr(record, 'processing_time'):
-            log_entry["processing_time"] = record.processing_time
-        
-        if hasattr(record, 'method_results'):
-            log_entry["method_results"] = record.method_results
+        rd = record.__dict__
+        if not _EXTRA_KEY_SET.isdisjoint(rd):
+            for key in _EXTRA_KEYS:
+                if key in rd:
+                    log_entry[key] = rd[key]
         
         if record.exc_info:
             log_entry["exception"] = self.formatException(record.exc_info)
         
-        return json.dumps(log_entry, ensure_ascii=False, default=str)
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(
+                log_entry,
+                default=_json_default,
+                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+            ).decode("utf-8")
+        return json.dumps(log_entry, ensure_ascii=False, default=_json_default)
 
 
 class ColoredConsoleFormatter(logging.Formatter):
@@ -66,28 +116,36 @@ class ColoredConsoleFormatter(logging.Formatter):
         'RESET': '\033[0m'        # Reset
     }
     
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Prefijo y sufijo ANSI por nivel, calculados una sola vez
+        reset = self.COLORS['RESET']
+        self._wrap = {level: (color, reset) for level, color in self.COLORS.items()}
+        self._default_wrap = (reset, reset)
+    
     def format(self, record):
         """Formatea el registro con colores"""
-        color = self.COLORS.get(record.levelname, self.COLORS['RESET'])
-        reset = self.COLORS['RESET']
+        color, reset = self._wrap.get(record.levelname, self._default_wrap)
         
-        # Formatear el mensaje básico
+        # Formatear el mensaje básico (incluye asctime y trazas de excepción)
         formatted = super().format(record)
         
         # Agregar información adicional si está disponible
-        extras = []
-        
-        if hasattr(record, 'document_type'):
-            extras.append(f"tipo={record.document_type}")
-        
-        if hasattr(record, 'confidence'):
-            extras.append(f"conf={record.confidence:.3f}")
-        
-        if hasattr(record, 'processing_time'):
-            extras.append(f"tiempo={record.processing_time:.2f}s")
-        
-        if extras:
-            formatted += f" [{', '.join(extras)}]"
+        rd = record.__dict__
+        if not _EXTRA_KEY_SET.isdisjoint(rd):
+            extras = []
+            
+            if 'document_type' in rd:
+                extras.append(f"tipo={rd['document_type']}")
+            
+            if 'confidence' in rd:
+                extras.append(f"conf={rd['confidence']:.3f}")
+            
+            if 'processing_time' in rd:
+                extras.append(f"tiempo={rd['processing_time']:.2f}s")
+            
+            if extras:
+                formatted += f" [{', '.join(extras)}]"
         
         return f"{color}{formatted}{reset}"
 
@@ -103,25 +161,27 @@ class PerformanceLogger:
     
     def start_timer(self, operation_id: str):
         """Inicia un cronómetro para una operación"""
-        self.start_times[operation_id] = datetime.now()
+        self.start_times[operation_id] = time.perf_counter_ns()
     
     def end_timer(self, operation_id: str, **extra_info):
         """Termina un cronómetro y registra el tiempo transcurrido"""
         if operation_id in self.start_times:
-            start_time = self.start_times[operation_id]
-            end_time = datetime.now()
-            duration = (end_time - start_time).total_seconds()
-            
-            log_data = {
-                "operation": operation_id,
-                "duration": duration,
-                "start_time": start_time.isoformat(),
-                "end_time": end_time.isoformat(),
-                **extra_info
-            }
+            start_ns = self.start_times.pop(operation_id)
+            duration = (time.perf_counter_ns() - start_ns) / 1e9
             
-            self.logger.info(f"Operación completada: {operation_id}", extra=log_data)
-            del self.start_times[operation_id]
+            # Los timestamps ISO solo se construyen si el registro se va a emitir
+            if self.logger.isEnabledFor(logging.INFO):
+                end_time = datetime.now()
+                start_time = end_time - timedelta(seconds=duration)
+                log_data = {
+                    "operation": operation_id,
+                    "duration": duration,
+                    "start_time": start_time.isoformat(),
+                    "end_time": end_time.isoformat(),
+                    **extra_info
+                }
+                
+                self.logger.info(f"Operación completada: {operation_id}", extra=log_data)
             return duration
         else:
             self.logger.warning(f"No se encontró cronómetro para: {operation_id}")
@@ -144,6 +204,9 @@ class ClassificationLogger:
             document_path: Ruta del documento clasificado
             classification_result: Resultado completo de la clasificación inteligente
         """
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        
         log_data = {
             "document_path": document_path,
             "final_classification": classification_result.get("final_classification"),
@@ -155,9 +218,10 @@ class ClassificationLogger:
         }
         
         self.logger.info(
-            f"Clasificación: {os.path.basename(document_path)} -> "
-            f"{classification_result.get('final_classification')} "
-            f"(confianza: {classification_result.get('final_confidence', 0):.3f})",
+            "Clasificación: %s -> %s (confianza: %.3f)",
+            os.path.basename(document_path),
+            log_data["final_classification"],
+            classification_result.get("final_confidence", 0),
             extra=log_data
         )
     
@@ -172,6 +236,10 @@ class ClassificationLogger:
             success: Si el método se ejecutó exitosamente
             error_msg: Mensaje de error si hubo falla
         """
+        level = logging.INFO if success else logging.ERROR
+        if not self.logger.isEnabledFor(level):
+            return
+        
         log_data = {
             "method": method_name,
             "processing_time": processing_time,
@@ -179,10 +247,104 @@ class ClassificationLogger:
             "error": error_msg
         }
         
-        level = logging.INFO if success else logging.ERROR
-        message = f"Método {method_name}: {'exitoso' if success else 'fallido'} ({processing_time:.3f}s)"
+        self.logger.log(
+            level,
+            "Método %s: %s (%.3fs)",
+            method_name,
+            "exitoso" if success else "fallido",
+            processing_time,
+            extra=log_data
+        )
+
+
+class _LocalQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler para un listener del mismo proceso
+    
+    A diferencia de prepare() por defecto, no formatea el registro ni descarta
+    exc_info: solo fija el mensaje, para que cada handler del listener aplique
+    su propio formateador (p. ej. el campo "exception" de StructuredFormatter).
+    """
+    
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+# Listeners activos; se detienen al reconfigurar y al salir para vaciar las colas
+_QUEUE_LISTENERS = []
+
+
+def _stop_queue_listeners():
+    """Detiene los listeners activos, escribiendo los registros pendientes"""
+    while _QUEUE_LISTENERS:
+        listener = _QUEUE_LISTENERS.pop()
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+
+
+atexit.register(_stop_queue_listeners)
+
+
+def _queue_handler_for(*handlers: logging.Handler) -> logging.Handler:
+    """
+    Mueve la escritura de los handlers a un hilo de fondo
+    
+    Args:
+        handlers: Handlers que escribirán desde el hilo del listener
+        
+    Returns:
+        QueueHandler a registrar en el logger en lugar de los handlers
+    """
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    _QUEUE_LISTENERS.append(listener)
+    return _LocalQueueHandler(log_queue)
+
+
+class _ForwardingHandler(logging.Handler):
+    """Entrega los registros recibidos de otro proceso a los loggers de este proceso"""
+    
+    def emit(self, record):
+        logging.getLogger(record.name).handle(record)
+
+
+def start_worker_log_listener(context) -> Tuple[Any, logging.handlers.QueueListener]:
+    """
+    Crea la cola por la que los procesos worker envían sus registros
+    
+    Los registros recibidos pasan por los loggers de este proceso, así que
+    terminan en los mismos archivos y consola que los del proceso principal.
+    
+    Args:
+        context: Contexto de multiprocessing con el que se crean los workers
         
-        self.logger.log(level, message, extra=log_data)
+    Returns:
+        Tupla (cola para configure_worker_logging, listener a detener con stop())
+    """
+    log_queue = context.Queue()
+    listener = logging.handlers.QueueListener(log_queue, _ForwardingHandler())
+    listener.start()
+    return log_queue, listener
+
+
+def configure_worker_logging(log_queue, level: int):
+    """
+    Envía los registros de un proceso worker al proceso principal
+    
+    Args:
+        log_queue: Cola creada por start_worker_log_listener
+        level: Nivel mínimo a enviar (el del logger raíz del proceso principal)
+    """
+    root_logger = logging.getLogger()
+    root_logger.handlers.clear()
+    # QueueHandler formatea el mensaje y la excepción antes de enviarlos
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    root_logger.setLevel(level)
 
 
 def setup_advanced_logging():
@@ -199,6 +361,7 @@ def setup_advanced_logging():
     
     # Limpiar handlers existentes
     root_logger.handlers.clear()
+    _stop_queue_listeners()
     
     # 1. Handler para archivo principal con rotación
     file_handler = logging.handlers.RotatingFileHandler(
@@ -214,15 +377,11 @@ def setup_advanced_logging():
     else:
         file_handler.setFormatter(logging.Formatter(LOGGING_CONFIG["format"]))
     
-    root_logger.addHandler(file_handler)
-    
     # 2. Handler para consola con colores
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(getattr(logging, LOGGING_CONFIG["console_level"]))
     console_handler.setFormatter(ColoredConsoleFormatter(LOGGING_CONFIG["format"]))
     
-    root_logger.addHandler(console_handler)
-    
     # 3. Handler separado para errores
     error_file = log_dir / "errors.log"
     error_handler = logging.handlers.RotatingFileHandler(
@@ -234,7 +393,8 @@ def setup_advanced_logging():
     error_handler.setLevel(logging.ERROR)
     error_handler.setFormatter(logging.Formatter(LOGGING_CONFIG["format"]))
     
-    root_logger.addHandler(error_handler)
+    # Los handlers escriben desde un hilo de fondo; quien loguea solo encola
+    root_logger.addHandler(_queue_handler_for(file_handler, console_handler, error_handler))
     
     # 4. Handler para rendimiento (si está habilitado)
     if LOGGING_CONFIG.get("log_performance", False):
@@ -250,7 +410,8 @@ def setup_advanced_logging():
         
         # Aplicar solo al logger de performance
         perf_logger = logging.getLogger("performance")
-        perf_logger.addHandler(performance_handler)
+        perf_logger.handlers.clear()
+        perf_logger.addHandler(_queue_handler_for(performance_handler))
         perf_logger.setLevel(logging.INFO)
     
     # 5. Handler para clasificación detallada (si está habilitado)
@@ -267,7 +428,8 @@ def setup_advanced_logging():
         
         # Aplicar solo al logger de clasificación
         class_logger = logging.getLogger("classification")
-        class_logger.addHandler(classification_handler)
+        class_logger.handlers.clear()
+        class_logger.addHandler(_queue_handler_for(classification_handler))
         class_logger.setLevel(logging.INFO)
     
     # Log de inicio del sistema
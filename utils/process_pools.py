@@ -0,0 +1,16 @@
+"""
+Configuración compartida de los pools de procesos del agente PDF
+"""
+import multiprocessing
+
+# Los workers no se crean con fork: los pools arrancan con hilos activos
+# (escritor de la base de datos, listeners de logging, workers del servidor web)
+# y un fork podría heredar locks tomados por ellos
+WORKER_START_METHOD = (
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+
+def get_worker_context():
+    """Retorna el contexto de multiprocessing con el que se crean los pools de workers"""
+    return multiprocessing.get_context(WORKER_START_METHOD)
@@ -58,12 +58,15 @@ class AdvancedPDFValidator:
         self.quarantine_dir = Path("quarantine")
         self.quarantine_dir.mkdir(exist_ok=True)
     
-    def validate_pdf_comprehensive(self, file_path: str) -> ValidationResult:
+    def validate_pdf_comprehensive(self, file_path: str, doc: Optional[fitz.Document] = None) -> ValidationResult:
         """
         Realiza validación exhaustiva de un archivo PDF
         
+        El PDF se abre (y se parsea) una sola vez para todas las verificaciones.
+        
         Args:
             file_path: Ruta al archivo PDF
+            doc: Documento ya abierto por el llamador (opcional, no se cierra)
             
         Returns:
             ValidationResult con detalles completos de la validación
@@ -78,26 +81,26 @@ class AdvancedPDFValidator:
             if result.errors:
                 return result
             
-            # 2. Validación de estructura PDF
-            self._validate_pdf_structure(file_path, result)
-            if result.errors:
+            # 2-7. Validaciones sobre el documento abierto
+            structure_ok = False
+            owns_doc = doc is None
+            if owns_doc:
+                try:
+                    doc = fitz.open(file_path)
+                except Exception as e:
+                    doc = None
+                    result.add_error(f"Error abriendo PDF: {str(e)}")
+            
+            if doc is not None:
+                try:
+                    structure_ok = self._validate_document(doc, file_path, result)
+                finally:
+                    if owns_doc:
+                        doc.close()
+            
+            if not structure_ok:
                 return result
             
-            # 3. Validación de seguridad y encriptación
-            self._validate_security(file_path, result)
-            
-            # 4. Validación de contenido
-            self._validate_content_extractability(file_path, result)
-            
-            # 5. Análisis de metadatos
-            self._analyze_metadata(file_path, result)
-            
-            # 6. Verificación de integridad
-            self._verify_integrity(file_path, result)
-            
-            # 7. Análisis de páginas
-            self._analyze_pages(file_path, result)
-            
             # Determinar si es válido
             result.is_valid = len(result.errors) == 0
             
@@ -155,11 +158,37 @@ class AdvancedPDFValidator:
         if mime_type and mime_type != "application/pdf":
             result.add_warning(f"Tipo MIME inesperado: {mime_type}")
     
-    def _validate_pdf_structure(self, file_path: str, result: ValidationResult):
+    def _validate_document(self, doc: fitz.Document, file_path: str, result: ValidationResult) -> bool:
+        """
+        Ejecuta las validaciones que usan el documento abierto
+        
+        Returns:
+            False si la estructura es inválida (no se ejecutan las demás validaciones)
+        """
+        # 2. Validación de estructura PDF
+        self._validate_pdf_structure(doc, result)
+        if result.errors:
+            return False
+        
+        # 3. Validación de seguridad y encriptación
+        self._validate_security(doc, result)
+        
+        # 4. Validación de contenido
+        self._validate_content_extractability(doc, result)
+        
+        # 5. Análisis de metadatos
+        self._analyze_metadata(doc, result)
+        
+        # 6. Verificación de integridad
+        self._verify_integrity(file_path, result)
+        
+        # 7. Análisis de páginas
+        self._analyze_pages(doc, result)
+        return True
+    
+    def _validate_pdf_structure(self, doc: fitz.Document, result: ValidationResult):
         """Valida la estructura interna del PDF"""
         try:
-            doc = fitz.open(file_path)
-            
             # Información básica del documento
             result.pdf_metadata = {
                 "page_count": len(doc),
@@ -183,16 +212,12 @@ class AdvancedPDFValidator:
             if doc.is_closed:
                 result.add_error("El documento PDF está dañado o corrupto")
             
-            doc.close()
-            
         except Exception as e:
             result.add_error(f"Error abriendo PDF: {str(e)}")
     
-    def _validate_security(self, file_path: str, result: ValidationResult):
+    def _validate_security(self, doc: fitz.Document, result: ValidationResult):
         """Valida aspectos de seguridad del PDF"""
         try:
-            doc = fitz.open(file_path)
-            
             security_info = {
                 "is_encrypted": doc.is_encrypted,
                 "needs_password": doc.needs_pass,
@@ -218,17 +243,14 @@ class AdvancedPDFValidator:
                 }
             
             result.security_info = security_info
-            doc.close()
             
         except Exception as e:
             result.add_warning(f"Error verificando seguridad: {str(e)}")
     
-    def _validate_content_extractability(self, file_path: str, result: ValidationResult):
+    def _validate_content_extractability(self, doc: fitz.Document, result: ValidationResult):
         """Valida si se puede extraer contenido del PDF"""
         try:
-            doc = fitz.open(file_path)
-            
-            total_text = ""
+            text_parts = []
             extractable_pages = 0
             pages_with_images = 0
             
@@ -239,13 +261,15 @@ class AdvancedPDFValidator:
                 # Intentar extraer texto
                 page_text = page.get_text()
                 if page_text.strip():
-                    total_text += page_text
+                    text_parts.append(page_text)
                     extractable_pages += 1
                 
                 # Verificar si tiene imágenes
                 if page.get_images():
                     pages_with_images += 1
             
+            total_text = "".join(text_parts)
+            
             content_analysis = {
                 "total_characters": len(total_text),
                 "extractable_pages": extractable_pages,
@@ -263,16 +287,13 @@ class AdvancedPDFValidator:
                         result.add_warning("Texto mínimo pero contiene imágenes (posible OCR necesario)")
             
             result.content_analysis = content_analysis
-            doc.close()
             
         except Exception as e:
             result.add_error(f"Error validando contenido: {str(e)}")
     
-    def _analyze_metadata(self, file_path: str, result: ValidationResult):
+    def _analyze_metadata(self, doc: fitz.Document, result: ValidationResult):
         """Analiza los metadatos del PDF"""
         try:
-            doc = fitz.open(file_path)
-            
             metadata = doc.metadata
             if metadata:
                 result.pdf_metadata.update({
@@ -286,8 +307,6 @@ class AdvancedPDFValidator:
                     "modification_date": metadata.get("modDate", "")
                 })
             
-            doc.close()
-            
         except Exception as e:
             result.add_warning(f"Error analizando metadatos: {str(e)}")
     
@@ -297,31 +316,25 @@ class AdvancedPDFValidator:
             return
         
         try:
-            # Calcular hash del archivo
+            # Calcular hash y verificar que el archivo se puede leer completamente (una sola lectura)
             sha256_hash = hashlib.sha256()
+            file_size = 0
             with open(file_path, "rb") as f:
-                for chunk in iter(lambda: f.read(4096), b""):
+                while chunk := f.read(65536):
                     sha256_hash.update(chunk)
+                    file_size += len(chunk)
             
             result.file_info["sha256"] = sha256_hash.hexdigest()
             
-            # Verificar que el archivo se puede leer completamente
-            with open(file_path, "rb") as f:
-                file_size = 0
-                while chunk := f.read(8192):
-                    file_size += len(chunk)
-                
-                if file_size != result.file_info["size"]:
-                    result.add_error("Inconsistencia en el tamaño del archivo durante lectura")
+            if file_size != result.file_info["size"]:
+                result.add_error("Inconsistencia en el tamaño del archivo durante lectura")
         
         except Exception as e:
             result.add_warning(f"Error verificando integridad: {str(e)}")
     
-    def _analyze_pages(self, file_path: str, result: ValidationResult):
+    def _analyze_pages(self, doc: fitz.Document, result: ValidationResult):
         """Analiza las páginas del documento"""
         try:
-            doc = fitz.open(file_path)
-            
             page_analysis = {
                 "total_pages": len(doc),
                 "pages_with_text": 0,
@@ -361,7 +374,6 @@ class AdvancedPDFValidator:
                 page_analysis["average_text_length"] = total_text_length / page_analysis["pages_with_text"]
             
             result.content_analysis.update(page_analysis)
-            doc.close()
             
         except Exception as e:
             result.add_warning(f"Error analizando páginas: {str(e)}")
@@ -560,17 +572,18 @@ class AdvancedPDFValidator:
         
         return results
     
-    def validate_pdf(self, file_path: str) -> bool:
+    def validate_pdf(self, file_path: str, doc: Optional[fitz.Document] = None) -> bool:
         """
         Método de compatibilidad para validación simple
         
         Args:
             file_path: Ruta al archivo PDF
+            doc: Documento ya abierto por el llamador (opcional)
             
         Returns:
             True si el archivo es válido
         """
-        result = self.validate_pdf_comprehensive(file_path)
+        result = self.validate_pdf_comprehensive(file_path, doc)
         return result.is_valid
     
     def get_validation_summary(self) -> Dict:
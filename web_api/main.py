@@ -20,9 +20,19 @@ import uvicorn
 sys.path.append(str(Path(__file__).parent.parent))
 
 from config import OUTPUT_DIR, INPUT_DIR
-from processors import DocumentProcessor, BatchProcessor
+from processors import DocumentProcessor, BatchProcessor, preload_components, disable_process_pool
 from exporters import AdvancedDataExporter
 from validators import PDFValidator
+from extractors import disable_parallel_pages
+
+# Los workers del servidor ya reparten la carga entre CPUs: extraer páginas o
+# procesar lotes en un pool de procesos propio por worker solo las sobresuscribiría
+disable_parallel_pages()
+disable_process_pool()
+
+# Cargar los clasificadores al importar la app: con Gunicorn --preload se cargan
+# una sola vez en el proceso maestro y los workers los comparten tras el fork
+preload_components(enable_ml=True, enable_layout=True)
 
 # Configuración de la aplicación
 app = FastAPI(